@@ -7,48 +7,142 @@ import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
-import warnings
-warnings.filterwarnings('ignore')
+from functools import lru_cache
+import sys
+
+# The scalar predictors below depend only on team strengths, so results are
+# memoized on the strength values themselves (recalculated strengths simply
+# produce new cache keys)
+
+@lru_cache(maxsize=4096)
+def _predict_outcome(home_overall, away_overall):
+    """Home win / draw / away win probabilities for a pair of overall strengths"""
+    # Home advantage factor
+    HOME_ADVANTAGE = 0.15
+    
+    # Calculate strength differential
+    home_total = home_overall * (1 + HOME_ADVANTAGE)
+    away_total = away_overall
+    
+    strength_diff = home_total - away_total
+    
+    # Convert to probabilities using logistic function
+    # Normalize to get win/draw/loss probabilities
+    if strength_diff > 50:
+        home_win = 0.60 + min(strength_diff / 500, 0.25)
+        draw = 0.25
+        away_win = 1 - home_win - draw
+    elif strength_diff > 0:
+        home_win = 0.45 + (strength_diff / 200)
+        draw = 0.30
+        away_win = 1 - home_win - draw
+    elif strength_diff > -50:
+        away_win = 0.35 + abs(strength_diff) / 200
+        draw = 0.30
+        home_win = 1 - away_win - draw
+    else:
+        away_win = 0.50 + min(abs(strength_diff) / 500, 0.25)
+        draw = 0.25
+        home_win = 1 - away_win - draw
+    
+    return (
+        max(0.05, min(0.85, home_win)),
+        max(0.15, min(0.40, draw)),
+        max(0.05, min(0.85, away_win))
+    )
+
+
+@lru_cache(maxsize=4096)
+def _predict_goals(home_attack, home_defense, away_attack, away_defense):
+    """Expected home, away and total goals for a pair of team strengths"""
+    # Home goals = (home attack + away weak defense) / normalization
+    home_goals = (home_attack / 30) * (1 - away_defense / 150) * 1.3
+    
+    # Away goals = (away attack + home weak defense) / normalization  
+    away_goals = (away_attack / 30) * (1 - home_defense / 150) * 1.1
+    
+    # Ensure realistic values
+    home_goals = max(0.3, min(3.5, home_goals))
+    away_goals = max(0.2, min(3.0, away_goals))
+    
+    return round(home_goals, 2), round(away_goals, 2), round(home_goals + away_goals, 2)
+
+
+@lru_cache(maxsize=4096)
+def _predict_clean_sheet(team_defense, opp_attack, is_home):
+    """Clean sheet probability for a defense facing an attack"""
+    # Strong defense + weak attack = higher CS chance
+    defense_factor = team_defense / 100
+    attack_factor = 1 - (opp_attack / 100)
+    
+    cs_prob = (defense_factor + attack_factor) / 2
+    
+    # Home advantage for clean sheets
+    if is_home:
+        cs_prob *= 1.1
+    
+    return max(0.05, min(0.65, cs_prob))
+
 
 class AdvancedFixturePredictor:
     def __init__(self, fetcher, analyzer):
         self.fetcher = fetcher
         self.analyzer = analyzer
-        self.team_strength = {}
+        self.team_strength = None
+        self._team_idx = None
+        self._fixture_rows_source = None
         self.models_trained = False
         
+        # exp(-total_goals * rate) for the 0.5/1.5/2.5/3.5 lines, tabulated for
+        # total goals 0.00-6.50 in 0.01 steps (predict_goals rounds to 2 dp)
+        over_rates = np.array([0.8, 0.5, 0.35, 0.25])
+        self._over_table = np.exp(-np.arange(651) / 100 * over_rates[:, None])
+        
     def calculate_team_strength(self):
         """Calculate team strength based on player quality"""
         players_df = self.analyzer.players_df
-        
-        # Group by team
-        team_stats = {}
-        for team in players_df['team_short'].unique():
-            team_players = players_df[players_df['team_short'] == team]
-            
-            # Calculate attack strength
-            attackers = team_players[team_players['position'].isin(['MID', 'FWD'])]
-            attack_strength = (
-                attackers['expected_goals'].astype(float).sum() +
-                attackers['expected_assists'].astype(float).sum() +
-                attackers['total_points'].sum() / 100
-            )
-            
-            # Calculate defense strength
-            defenders = team_players[team_players['position'].isin(['GK', 'DEF'])]
-            defense_strength = (
-                defenders['clean_sheets'].sum() * 2 +
-                defenders['total_points'].sum() / 100 -
-                defenders['goals_conceded'].sum() / 10
-            )
-            
-            # Overall strength
-            team_stats[team] = {
-                'attack': attack_strength,
-                'defense': defense_strength,
-                'overall': attack_strength + defense_strength,
-                'avg_points': team_players['total_points'].mean()
-            }
+        teams = self.analyzer._teams
+        
+        stats = players_df[[
+            'team_short', 'expected_goals', 'expected_assists', 'total_points',
+            'clean_sheets', 'goals_conceded'
+        ]]
+        
+        # Sum per team in one groupby pass (teams without attackers/defenders get 0)
+        is_attacker = self.analyzer._is_attacker
+        is_defender = self.analyzer._is_defender
+        attackers = stats[is_attacker].groupby('team_short', observed=True).sum().reindex(teams, fill_value=0)
+        defenders = stats[is_defender].groupby('team_short', observed=True).sum().reindex(teams, fill_value=0)
+        
+        # Calculate attack strength
+        attack_strength = (
+            attackers['expected_goals'] +
+            attackers['expected_assists'] +
+            attackers['total_points'] / 100
+        )
+        
+        # Calculate defense strength
+        defense_strength = (
+            defenders['clean_sheets'] * 2 +
+            defenders['total_points'] / 100 -
+            defenders['goals_conceded'] / 10
+        )
+        
+        # Overall strength
+        team_stats = pd.DataFrame({
+            'attack': attack_strength,
+            'defense': defense_strength,
+            'overall': attack_strength + defense_strength,
+            'avg_points': stats.groupby('team_short', observed=True)['total_points'].mean()
+        })
+        
+        # Predictors index these per-attribute arrays by team row; the extra
+        # last row holds the defaults used for unknown teams
+        self._team_idx = {team: i for i, team in enumerate(team_stats.index)}
+        self._team_index = pd.Index(list(self._team_idx))
+        self._attack = np.append(team_stats['attack'].to_numpy(dtype=float), 50)
+        self._defense = np.append(team_stats['defense'].to_numpy(dtype=float), 50)
+        self._overall = np.append(team_stats['overall'].to_numpy(dtype=float), 100)
         
         self.team_strength = team_stats
         return team_stats
@@ -58,182 +152,257 @@ class AdvancedFixturePredictor:
         Predict match outcome using team strength and home advantage
         Returns probabilities for: Home Win, Draw, Away Win
         """
-        if not self.team_strength:
+        if self._team_idx is None:
             self.calculate_team_strength()
         
-        home_stats = self.team_strength.get(home_team, {'attack': 50, 'defense': 50, 'overall': 100})
-        away_stats = self.team_strength.get(away_team, {'attack': 50, 'defense': 50, 'overall': 100})
-        
-        # Home advantage factor
-        HOME_ADVANTAGE = 0.15
+        home_idx = self._team_idx.get(home_team, -1)
+        away_idx = self._team_idx.get(away_team, -1)
         
-        # Calculate strength differential
-        home_total = home_stats['overall'] * (1 + HOME_ADVANTAGE)
-        away_total = away_stats['overall']
-        
-        strength_diff = home_total - away_total
-        
-        # Convert to probabilities using logistic function
-        # Normalize to get win/draw/loss probabilities
-        if strength_diff > 50:
-            home_win = 0.60 + min(strength_diff / 500, 0.25)
-            draw = 0.25
-            away_win = 1 - home_win - draw
-        elif strength_diff > 0:
-            home_win = 0.45 + (strength_diff / 200)
-            draw = 0.30
-            away_win = 1 - home_win - draw
-        elif strength_diff > -50:
-            away_win = 0.35 + abs(strength_diff) / 200
-            draw = 0.30
-            home_win = 1 - away_win - draw
-        else:
-            away_win = 0.50 + min(abs(strength_diff) / 500, 0.25)
-            draw = 0.25
-            home_win = 1 - away_win - draw
+        home_win, draw, away_win = _predict_outcome(
+            float(self._overall[home_idx]), float(self._overall[away_idx])
+        )
         
         return {
-            'home_win': max(0.05, min(0.85, home_win)),
-            'draw': max(0.15, min(0.40, draw)),
-            'away_win': max(0.05, min(0.85, away_win))
+            'home_win': home_win,
+            'draw': draw,
+            'away_win': away_win
         }
     
     def predict_goals(self, home_team, away_team):
         """Predict expected goals for both teams"""
-        if not self.team_strength:
+        if self._team_idx is None:
             self.calculate_team_strength()
         
-        home_stats = self.team_strength.get(home_team, {'attack': 50, 'defense': 50})
-        away_stats = self.team_strength.get(away_team, {'attack': 50, 'defense': 50})
+        home_idx = self._team_idx.get(home_team, -1)
+        away_idx = self._team_idx.get(away_team, -1)
         
-        # Home goals = (home attack + away weak defense) / normalization
-        home_goals = (home_stats['attack'] / 30) * (1 - away_stats['defense'] / 150) * 1.3
-        
-        # Away goals = (away attack + home weak defense) / normalization  
-        away_goals = (away_stats['attack'] / 30) * (1 - home_stats['defense'] / 150) * 1.1
-        
-        # Ensure realistic values
-        home_goals = max(0.3, min(3.5, home_goals))
-        away_goals = max(0.2, min(3.0, away_goals))
+        home_goals, away_goals, total_goals = _predict_goals(
+            float(self._attack[home_idx]), float(self._defense[home_idx]),
+            float(self._attack[away_idx]), float(self._defense[away_idx])
+        )
         
         return {
-            'home_goals': round(home_goals, 2),
-            'away_goals': round(away_goals, 2),
-            'total_goals': round(home_goals + away_goals, 2)
+            'home_goals': home_goals,
+            'away_goals': away_goals,
+            'total_goals': total_goals
         }
     
     def predict_clean_sheet(self, team, opponent, is_home=True):
         """Predict clean sheet probability"""
-        if not self.team_strength:
+        if self._team_idx is None:
             self.calculate_team_strength()
         
-        team_stats = self.team_strength.get(team, {'defense': 50})
-        opp_stats = self.team_strength.get(opponent, {'attack': 50})
+        team_idx = self._team_idx.get(team, -1)
+        opp_idx = self._team_idx.get(opponent, -1)
+        
+        return _predict_clean_sheet(
+            float(self._defense[team_idx]), float(self._attack[opp_idx]), bool(is_home)
+        )
+    
+    def predict_match_outcome_vec(self, home_overall, away_overall):
+        """
+        Vectorized predict_match_outcome over arrays of overall strengths
+        Returns arrays of: Home Win, Draw, Away Win probabilities
+        """
+        HOME_ADVANTAGE = 0.15
+        
+        strength_diff = np.asarray(home_overall) * (1 + HOME_ADVANTAGE) - np.asarray(away_overall)
+        abs_diff = np.abs(strength_diff)
+        
+        # Same four-way ladder as predict_match_outcome, as a band index
+        # (0: <= -50, 1: <= 0, 2: <= 50, 3: > 50)
+        band = np.digitize(strength_diff, [-50, 0, 50], right=True)
+        draw = np.array([0.25, 0.30, 0.30, 0.25])[band]
+        
+        # Win probability of the stronger side in each band
+        favourite_win = np.select(
+            [band == 3, band == 2, band == 1],
+            [0.60 + np.minimum(abs_diff / 500, 0.25), 0.45 + abs_diff / 200, 0.35 + abs_diff / 200],
+            default=0.50 + np.minimum(abs_diff / 500, 0.25)
+        )
+        home_favoured = band >= 2
+        home_win = np.where(home_favoured, favourite_win, 1 - favourite_win - draw)
+        away_win = np.where(home_favoured, 1 - favourite_win - draw, favourite_win)
+        
+        home_win, draw, away_win = np.clip(
+            np.stack([home_win, draw, away_win]),
+            [[0.05], [0.15], [0.05]], [[0.85], [0.40], [0.85]]
+        )
+        
+        return home_win, draw, away_win
+    
+    def predict_goals_vec(self, home_attack, home_defense, away_attack, away_defense):
+        """Vectorized predict_goals, returns home, away and total goal arrays"""
+        home_goals = (np.asarray(home_attack) / 30) * (1 - np.asarray(away_defense) / 150) * 1.3
+        away_goals = (np.asarray(away_attack) / 30) * (1 - np.asarray(home_defense) / 150) * 1.1
+        
+        home_goals = np.clip(home_goals, 0.3, 3.5)
+        away_goals = np.clip(away_goals, 0.2, 3.0)
+        
+        return (
+            np.round(home_goals, 2),
+            np.round(away_goals, 2),
+            np.round(home_goals + away_goals, 2)
+        )
+    
+    def _both_cs(self, team_defense, opp_attack, opp_defense, team_attack, is_home):
+        """
+        Vectorized predict_clean_sheet for both sides of each fixture at once
+        Returns the team's and the opponent's clean sheet probability arrays
+        """
+        is_home = np.asarray(is_home, dtype=bool)
         
-        # Strong defense + weak attack = higher CS chance
-        defense_factor = team_stats['defense'] / 100
-        attack_factor = 1 - (opp_stats['attack'] / 100)
+        # Row 0 is the team's defense against the opponent, row 1 the reverse
+        defense_factor = np.stack([team_defense, opp_defense]) / 100
+        attack_factor = 1 - (np.stack([opp_attack, team_attack]) / 100)
         
         cs_prob = (defense_factor + attack_factor) / 2
+        cs_prob = np.where(np.stack([is_home, ~is_home]), cs_prob * 1.1, cs_prob)
         
-        # Home advantage for clean sheets
-        if is_home:
-            cs_prob *= 1.1
+        team_cs, opp_cs = np.clip(cs_prob, 0.05, 0.65)
+        return team_cs, opp_cs
+    
+    def _over_probabilities(self, total_goals):
+        """Over 0.5/1.5/2.5/3.5 goals probabilities from the lookup table"""
+        idx = np.clip(np.rint(np.asarray(total_goals) * 100).astype(int), 0, self._over_table.shape[1] - 1)
+        return 1 - self._over_table[:, idx]
+    
+    def _strength_rows(self, teams):
+        """Strength array rows for a sequence of teams (-1 for unknown teams)"""
+        if self._team_idx is None:
+            self.calculate_team_strength()
         
-        return max(0.05, min(0.65, cs_prob))
+        return self._team_index.get_indexer(teams)
+    
+    def _batch_fixture_stats(self, team_idx, opp_idx, is_home):
+        """
+        Every per-fixture number for arrays of team/opponent strength rows,
+        computed in one pass over NumPy arrays
+        Returns win, draw, loss, goals for/against/total, clean sheet, BTTS,
+        the four over lines and FDR as arrays
+        """
+        # Home and away strength rows for the match-level predictions
+        home_idx = np.where(is_home, team_idx, opp_idx)
+        away_idx = np.where(is_home, opp_idx, team_idx)
+        
+        home_win, draw, away_win = self.predict_match_outcome_vec(
+            self._overall[home_idx], self._overall[away_idx]
+        )
+        home_goals, away_goals, total_goals = self.predict_goals_vec(
+            self._attack[home_idx], self._defense[home_idx],
+            self._attack[away_idx], self._defense[away_idx]
+        )
+        
+        cs_prob, opp_cs_prob = self._both_cs(
+            self._defense[team_idx], self._attack[opp_idx],
+            self._defense[opp_idx], self._attack[team_idx], is_home
+        )
+        
+        # Calculate BTTS (Both Teams To Score)
+        btts_prob = 1 - (cs_prob * opp_cs_prob)
+        
+        # Calculate over/under probabilities
+        over_05, over_15, over_25, over_35 = self._over_probabilities(total_goals)
+        
+        win_prob = np.where(is_home, home_win, away_win)
+        loss_prob = np.where(is_home, away_win, home_win)
+        
+        # FDR based on win probability (inverted): 2 Easy, 3 Medium, 4 Hard, 5 Very Hard
+        fdr = 5 - np.digitize(win_prob, [0.25, 0.40, 0.55], right=True)
+        
+        return (
+            win_prob, draw, loss_prob,
+            np.where(is_home, home_goals, away_goals),
+            np.where(is_home, away_goals, home_goals),
+            total_goals, cs_prob, btts_prob,
+            over_05, over_15, over_25, over_35, fdr
+        )
+    
+    def _team_fixture_rows(self):
+        """
+        Unfinished fixtures as one row per team side, in schedule order.
+        Built once per fixtures_df and partitioned by team for direct lookups
+        """
+        fixtures_df = self.analyzer.fixtures_df
+        if self._fixture_rows_source is fixtures_df:
+            return self._fixture_rows
+        
+        upcoming = fixtures_df[fixtures_df['finished'] == False]
+        
+        home = pd.DataFrame({
+            'team': upcoming['home_team'], 'opponent': upcoming['away_team'],
+            'is_home': True, 'event': upcoming['event']
+        })
+        away = pd.DataFrame({
+            'team': upcoming['away_team'], 'opponent': upcoming['home_team'],
+            'is_home': False, 'event': upcoming['event']
+        })
+        
+        # Stable sort keeps each team's fixtures in schedule order
+        rows = pd.concat([home, away]).sort_index(kind='stable')
+        
+        self._fixture_rows = rows
+        self._fixtures_by_team = dict(tuple(rows.groupby('team', sort=False)))
+        self._fixture_rows_source = fixtures_df
+        return rows
+    
+    def _analyze_fixtures(self, rows):
+        """Run every prediction for a batch of team fixtures in one pass"""
+        is_home = rows['is_home'].to_numpy(dtype=bool)
+        
+        (win_prob, draw, loss_prob, goals_for, goals_against, total_goals,
+         cs_prob, btts_prob, over_05, over_15, over_25, over_35, fdr) = self._batch_fixture_stats(
+            self._strength_rows(rows['team']), self._strength_rows(rows['opponent']), is_home
+        )
+        
+        return pd.DataFrame({
+            'team': rows['team'].to_numpy(),
+            'gameweek': rows['event'].to_numpy(),
+            'opponent': rows['opponent'].to_numpy(),
+            'venue': np.where(is_home, 'H', 'A'),
+            'fdr': fdr,
+            'win_prob': np.round(win_prob * 100, 1),
+            'draw_prob': np.round(draw * 100, 1),
+            'loss_prob': np.round(loss_prob * 100, 1),
+            'expected_goals': goals_for,
+            'expected_conceded': goals_against,
+            'total_goals': total_goals,
+            'clean_sheet_prob': np.round(cs_prob * 100, 1),
+            'btts_prob': np.round(btts_prob * 100, 1),
+            'over_05': np.round(over_05 * 100, 1),
+            'over_15': np.round(over_15 * 100, 1),
+            'over_25': np.round(over_25 * 100, 1),
+            'over_35': np.round(over_35 * 100, 1),
+            'zero_zero_prob': np.round((1 - over_05) * 100, 1)
+        })
     
     def calculate_advanced_fdr(self, team, next_n_fixtures=5):
         """
         Calculate advanced FDR for a team's next fixtures
         Returns detailed analysis for each fixture
         """
-        fixtures_df = self.analyzer.fixtures_df
+        self._team_fixture_rows()
         
         # Get upcoming fixtures
-        upcoming = fixtures_df[
-            (fixtures_df['finished'] == False) &
-            ((fixtures_df['home_team'] == team) | (fixtures_df['away_team'] == team))
-        ].head(next_n_fixtures).copy()
-        
-        fixture_analysis = []
-        
-        for _, fixture in upcoming.iterrows():
-            is_home = fixture['home_team'] == team
-            opponent = fixture['away_team'] if is_home else fixture['home_team']
-            
-            # Get match predictions
-            if is_home:
-                outcome = self.predict_match_outcome(team, opponent)
-                goals = self.predict_goals(team, opponent)
-                team_goals_exp = goals['home_goals']
-                opp_goals_exp = goals['away_goals']
-            else:
-                outcome = self.predict_match_outcome(opponent, team)
-                goals = self.predict_goals(opponent, team)
-                team_goals_exp = goals['away_goals']
-                opp_goals_exp = goals['home_goals']
-            
-            cs_prob = self.predict_clean_sheet(team, opponent, is_home)
-            
-            # Calculate BTTS (Both Teams To Score)
-            btts_prob = 1 - (cs_prob * self.predict_clean_sheet(opponent, team, not is_home))
-            
-            # Calculate over/under probabilities
-            total_goals = goals['total_goals']
-            over_05 = 1 - np.exp(-total_goals * 0.8)
-            over_15 = 1 - np.exp(-total_goals * 0.5)
-            over_25 = 1 - np.exp(-total_goals * 0.35)
-            over_35 = 1 - np.exp(-total_goals * 0.25)
-            
-            # Calculate FDR (1-5, lower is easier)
-            if is_home:
-                win_prob = outcome['home_win']
-            else:
-                win_prob = outcome['away_win']
-            
-            # FDR based on win probability (inverted)
-            if win_prob > 0.55:
-                fdr = 2  # Easy
-            elif win_prob > 0.40:
-                fdr = 3  # Medium
-            elif win_prob > 0.25:
-                fdr = 4  # Hard
-            else:
-                fdr = 5  # Very Hard
-            
-            fixture_analysis.append({
-                'gameweek': fixture['event'],
-                'opponent': opponent,
-                'venue': 'H' if is_home else 'A',
-                'fdr': fdr,
-                'win_prob': round(win_prob * 100, 1),
-                'draw_prob': round(outcome['draw'] * 100, 1),
-                'loss_prob': round((outcome['away_win'] if is_home else outcome['home_win']) * 100, 1),
-                'expected_goals': team_goals_exp,
-                'expected_conceded': opp_goals_exp,
-                'total_goals': total_goals,
-                'clean_sheet_prob': round(cs_prob * 100, 1),
-                'btts_prob': round(btts_prob * 100, 1),
-                'over_05': round(over_05 * 100, 1),
-                'over_15': round(over_15 * 100, 1),
-                'over_25': round(over_25 * 100, 1),
-                'over_35': round(over_35 * 100, 1),
-                'zero_zero_prob': round((1 - over_05) * 100, 1)
-            })
-        
-        return pd.DataFrame(fixture_analysis)
+        rows = self._fixtures_by_team.get(team)
+        if rows is None or len(rows.head(next_n_fixtures)) == 0:
+            return pd.DataFrame()
+        rows = rows.head(next_n_fixtures)
+        
+        return self._analyze_fixtures(rows).drop(columns='team')
     
     def get_all_teams_fdr(self, next_n_fixtures=5):
         """Get FDR for all teams"""
-        teams = self.analyzer.players_df['team_short'].unique()
+        teams = self.analyzer._teams
         
-        print(f"\n{'='*100}")
-        print(f"🎯 FIXTURE DIFFICULTY RATING - NEXT {next_n_fixtures} GAMEWEEKS")
-        print(f"{'='*100}\n")
+        # Analyze every team's upcoming fixtures in a single batch
+        rows = self._team_fixture_rows()
+        rows = rows[rows['team'].isin(teams)].groupby('team', sort=False).head(next_n_fixtures)
+        analysis = self._analyze_fixtures(rows) if len(rows) > 0 else pd.DataFrame(columns=['team'])
         
         all_fdr = {}
-        for team in sorted(teams):
-            fdr_df = self.calculate_advanced_fdr(team, next_n_fixtures)
+        for team, team_df in analysis.groupby('team', sort=True):
+            fdr_df = team_df.drop(columns='team').reset_index(drop=True)
             if len(fdr_df) > 0:
                 avg_fdr = fdr_df['fdr'].mean()
                 all_fdr[team] = {
@@ -244,23 +413,28 @@ class AdvancedFixturePredictor:
         # Sort by easiest fixtures
         sorted_teams = sorted(all_fdr.items(), key=lambda x: x[1]['avg_fdr'])
         
-        print("Team  | Avg FDR | Next 5 Fixtures (FDR)")
-        print("-" * 100)
+        # Build the whole table and write it in one go
+        lines = [
+            f"\n{'='*100}",
+            f"🎯 FIXTURE DIFFICULTY RATING - NEXT {next_n_fixtures} GAMEWEEKS",
+            f"{'='*100}\n",
+            "Team  | Avg FDR | Next 5 Fixtures (FDR)",
+            "-" * 100
+        ]
         for team, data in sorted_teams:
+            fixtures = data['fixtures']
             fixtures_str = " | ".join([
-                f"{row['opponent']}({row['venue']}):{row['fdr']}" 
-                for _, row in data['fixtures'].iterrows()
+                f"{opponent}({venue}):{fdr}"
+                for opponent, venue, fdr in zip(fixtures['opponent'], fixtures['venue'], fixtures['fdr'])
             ])
-            print(f"{team:4} | {data['avg_fdr']:5.2f}   | {fixtures_str}")
+            lines.append(f"{team:4} | {data['avg_fdr']:5.2f}   | {fixtures_str}")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return all_fdr
     
     def get_detailed_fixture_analysis(self, home_team, away_team):
         """Get detailed analysis for a specific fixture"""
-        print(f"\n{'='*100}")
-        print(f"⚽ DETAILED MATCH ANALYSIS: {home_team} vs {away_team}")
-        print(f"{'='*100}\n")
-        
         # Get predictions
         outcome = self.predict_match_outcome(home_team, away_team)
         goals = self.predict_goals(home_team, away_team)
@@ -270,32 +444,33 @@ class AdvancedFixturePredictor:
         btts = 1 - (home_cs * away_cs)
         
         total_goals = goals['total_goals']
-        over_05 = 1 - np.exp(-total_goals * 0.8)
-        over_15 = 1 - np.exp(-total_goals * 0.5)
-        over_25 = 1 - np.exp(-total_goals * 0.35)
-        over_35 = 1 - np.exp(-total_goals * 0.25)
-        
-        print(f"📊 MATCH OUTCOME PROBABILITIES")
-        print(f"  {home_team} Win: {outcome['home_win']*100:.1f}%")
-        print(f"  Draw:        {outcome['draw']*100:.1f}%")
-        print(f"  {away_team} Win: {outcome['away_win']*100:.1f}%")
-        
-        print(f"\n⚽ EXPECTED GOALS")
-        print(f"  {home_team}: {goals['home_goals']:.2f}")
-        print(f"  {away_team}: {goals['away_goals']:.2f}")
-        print(f"  Total:   {total_goals:.2f}")
-        
-        print(f"\n🛡️  CLEAN SHEET PROBABILITY")
-        print(f"  {home_team}: {home_cs*100:.1f}%")
-        print(f"  {away_team}: {away_cs*100:.1f}%")
-        
-        print(f"\n📈 GOALS MARKET")
-        print(f"  BTTS (Both Teams To Score): {btts*100:.1f}%")
-        print(f"  0-0:      {(1-over_05)*100:.1f}%")
-        print(f"  Over 0.5: {over_05*100:.1f}%")
-        print(f"  Over 1.5: {over_15*100:.1f}%")
-        print(f"  Over 2.5: {over_25*100:.1f}%")
-        print(f"  Over 3.5: {over_35*100:.1f}%")
+        over_05, over_15, over_25, over_35 = self._over_probabilities(total_goals)
+        
+        # Build the report and write it in one go
+        lines = [
+            f"\n{'='*100}",
+            f"⚽ DETAILED MATCH ANALYSIS: {home_team} vs {away_team}",
+            f"{'='*100}\n",
+            f"📊 MATCH OUTCOME PROBABILITIES",
+            f"  {home_team} Win: {outcome['home_win']*100:.1f}%",
+            f"  Draw:        {outcome['draw']*100:.1f}%",
+            f"  {away_team} Win: {outcome['away_win']*100:.1f}%",
+            f"\n⚽ EXPECTED GOALS",
+            f"  {home_team}: {goals['home_goals']:.2f}",
+            f"  {away_team}: {goals['away_goals']:.2f}",
+            f"  Total:   {total_goals:.2f}",
+            f"\n🛡️  CLEAN SHEET PROBABILITY",
+            f"  {home_team}: {home_cs*100:.1f}%",
+            f"  {away_team}: {away_cs*100:.1f}%",
+            f"\n📈 GOALS MARKET",
+            f"  BTTS (Both Teams To Score): {btts*100:.1f}%",
+            f"  0-0:      {(1-over_05)*100:.1f}%",
+            f"  Over 0.5: {over_05*100:.1f}%",
+            f"  Over 1.5: {over_15*100:.1f}%",
+            f"  Over 2.5: {over_25*100:.1f}%",
+            f"  Over 3.5: {over_35*100:.1f}%"
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return {
             'outcome': outcome,
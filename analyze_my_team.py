@@ -41,7 +41,7 @@ class FPLPlayerAnalyzer:
         
         # Calculate points per million
         df['points_per_million'] = df['total_points'] / df['price']
-        df['form_per_million'] = df['form'].astype(float) / df['price']
+        df['form_per_million'] = df['form'] / df['price']
         
         # Calculate expected involvement
         df['expected_involvement'] = df['expected_goals'] + df['expected_assists']
@@ -86,7 +86,11 @@ class FPLPlayerAnalyzer:
         home_fdr = upcoming[upcoming['home_team'] == team_name]['team_h_difficulty'].mean()
         away_fdr = upcoming[upcoming['away_team'] == team_name]['team_a_difficulty'].mean()
         
-        avg_fdr = np.nanmean([home_fdr, away_fdr])
+        # Mean of the two venue averages, skipping a venue with no games
+        if np.isnan(home_fdr) or np.isnan(away_fdr):
+            avg_fdr = away_fdr if np.isnan(home_fdr) else home_fdr
+        else:
+            avg_fdr = (home_fdr + away_fdr) / 2
         return avg_fdr if not np.isnan(avg_fdr) else 3
     
     def recommend_best_players(self, position=None, top_n=10):
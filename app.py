@@ -2,7 +2,7 @@
 FPL Analytics Web Application - Complete Backend with All Features
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 from flask_cors import CORS
 from fpl_main_app import FPLAssistant
 from price_predictor import PriceChangePredictor, add_price_predictor_to_assistant
@@ -10,53 +10,189 @@ from points_predictor import AIPointsPredictor, add_ai_predictor_to_assistant
 from live_tracker import LiveGameweekTracker, add_live_tracker_to_assistant
 from mini_league import MiniLeagueSpy, add_mini_league_spy_to_assistant
 from advanced_fixture_predictor import AdvancedFixturePredictor, add_fixture_predictor_to_assistant
+import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from operator import itemgetter
+from functools import wraps
 import json
 import os
+import tempfile
+import threading
+import traceback
 
 app = Flask(__name__)
 CORS(app)
 
-# Global assistant instance
+# Global assistant instance (built once, guarded for concurrent first requests)
 assistant = None
+_assistant_lock = threading.Lock()
+
+# Serialized responses of the data-only endpoints, keyed on path and query
+# string and dropped whenever the loaded players/fixtures frames change
+# (the lock keeps lookups and evictions from interleaving across threads)
+RESPONSE_CACHE_SIZE = 256
+_response_cache = OrderedDict()
+_response_cache_sources = (None, None)
+_response_cache_lock = threading.Lock()
+
+def _init_assistant():
+    """Create the assistant and attach ALL features"""
+    new_assistant = FPLAssistant()
+    new_assistant.initialize()
+    
+    # Add all advanced features
+    add_price_predictor_to_assistant(new_assistant)
+    add_ai_predictor_to_assistant(new_assistant)
+    add_live_tracker_to_assistant(new_assistant)
+    add_mini_league_spy_to_assistant(new_assistant)
+    add_fixture_predictor_to_assistant(new_assistant)
+    
+    _precompute_scores(new_assistant)
+    _precompute_lookups(new_assistant)
+    
+    print("✅ ALL features loaded (including Mini-League Spy)!")
+    return new_assistant
 
 def get_assistant():
     """Get or create assistant instance with ALL features"""
     global assistant
     if assistant is None:
-        assistant = FPLAssistant()
-        assistant.initialize()
-        
-        # Add all advanced features
-        add_price_predictor_to_assistant(assistant)
-        add_ai_predictor_to_assistant(assistant)
-        add_live_tracker_to_assistant(assistant)
-        add_mini_league_spy_to_assistant(assistant)
-        add_fixture_predictor_to_assistant(assistant)
-        
-        print("✅ ALL features loaded (including Mini-League Spy)!")
+        with _assistant_lock:
+            # Another request may have finished initializing while we waited
+            if assistant is None:
+                assistant = _init_assistant()
     return assistant
 
+def _precompute_scores(asst):
+    """
+    Rank captaincy and value picks once per players_df refresh
+    Endpoints then just slice the top N positions from the cached orders
+    """
+    analyzer = asst.analyzer
+    df = analyzer.players_df
+    if getattr(analyzer, '_scores_source', None) is df:
+        return
+    
+    price = df['price'].to_numpy()
+    available = df['status'].to_numpy() == 'a'
+    minutes = df['minutes'].to_numpy()
+    
+    # Captain score for every player, ranked among eligible captains
+    captain_score = (
+        df['form'].to_numpy() * 0.4 +
+        df['points_per_game'].to_numpy() * 0.4 +
+        df['expected_goal_involvements'].to_numpy() * 100 * 0.2
+    )
+    eligible = (price >= 8.0) & available & (minutes > 450) & ~np.isnan(captain_score)
+    order = np.argsort(-captain_score, kind='stable')
+    analyzer.captain_scores = captain_score
+    analyzer.captain_sorted_idx = order[eligible[order]]
+    
+    # Value ranking of regular starters (ownership is filtered per request)
+    value_score = df['value_score'].to_numpy()
+    eligible = available & (minutes > 180) & ~np.isnan(value_score)
+    order = np.argsort(-value_score, kind='stable')
+    analyzer.value_sorted_idx = order[eligible[order]]
+    
+    analyzer._scores_source = df
+
+def _precompute_lookups(asst):
+    """Build the player search and id indexes once per players_df refresh"""
+    analyzer = asst.analyzer
+    df = analyzer.players_df
+    if getattr(analyzer, '_lookups_source', None) is df:
+        return
+    
+    analyzer.name_lower = df['web_name'].fillna('').str.lower().to_numpy(dtype=str)
+    analyzer.id_to_pos = pd.Series(np.arange(len(df)), index=df['id'].to_numpy())
+    
+    analyzer._lookups_source = df
+
+def _player_positions(asst, player_ids):
+    """Row positions of the given player ids, in players_df order (unknown ids skipped)"""
+    _precompute_lookups(asst)
+    positions = asst.analyzer.id_to_pos.reindex(list(player_ids)).dropna()
+    return np.unique(positions.to_numpy(dtype=int))
+
+def _records_response(df):
+    """
+    Success response with a DataFrame's rows as the data list, serialized
+    straight from the columns instead of via to_dict + jsonify
+    """
+    records = df.to_json(orient='records', double_precision=15)
+    return Response('{"success": true, "data": ' + records + '}', mimetype='application/json')
+
+def _response_cache_key(asst):
+    """
+    Cache key for the current request (clears the cache on a data refresh)
+    Call with _response_cache_lock held
+    """
+    global _response_cache_sources
+    sources = (asst.analyzer.players_df, asst.analyzer.fixtures_df)
+    if sources[0] is not _response_cache_sources[0] or sources[1] is not _response_cache_sources[1]:
+        _response_cache.clear()
+        _response_cache_sources = sources
+    return (request.path, tuple(sorted(request.args.items(multi=True))))
+
+def _cached_response(asst):
+    """Previously built response for this request, or None"""
+    with _response_cache_lock:
+        key = _response_cache_key(asst)
+        body = _response_cache.get(key)
+        if body is None:
+            return None
+        _response_cache.move_to_end(key)
+    return Response(body, mimetype='application/json')
+
+def _cache_response(asst, response):
+    """Remember a successful response body for identical requests"""
+    body = response.get_data()
+    with _response_cache_lock:
+        key = _response_cache_key(asst)
+        _response_cache[key] = body
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    return response
+
+def json_endpoint(view):
+    """Turn any exception raised by an API view into a JSON error response"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            return view(*args, **kwargs)
+        except Exception as e:
+            if app.debug:
+                print(f"ERROR: {traceback.format_exc()}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+    return wrapper
+
+def _top_n(positions, top_n):
+    """First top_n of a ranked position array (empty for top_n <= 0, like nlargest)"""
+    return positions[:max(top_n, 0)]
+
 @app.route('/')
 def home():
     """Main dashboard page"""
     return render_template('index.html')
 
 @app.route('/api/best-players', methods=['GET'])
+@json_endpoint
 def best_players():
     """Get best value players"""
-    try:
-        asst = get_assistant()
-        position = request.args.get('position', None)
-        top_n = int(request.args.get('top_n', 20))
-        
-        result = asst.analyzer.recommend_best_players(position=position, top_n=top_n)
-        
-        return jsonify({
-            'success': True,
-            'data': result.to_dict('records')
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    cached = _cached_response(asst)
+    if cached is not None:
+        return cached
+    
+    position = request.args.get('position', None)
+    top_n = int(request.args.get('top_n', 20))
+    
+    result = asst.analyzer.recommend_best_players(position=position, top_n=top_n)
+    
+    return _cache_response(asst, _records_response(result))
 
 @app.route('/api/load-team', methods=['POST'])
 def load_team():
@@ -70,23 +206,26 @@ def load_team():
         
         asst = get_assistant()
         
-        # Load team with full manager data
+        # Load team with full manager data (the gameweek is read from the
+        # fetcher's bootstrap, which is only refetched once its TTL runs out)
         current_gw = asst.fetcher.get_current_gameweek()
         
-        # Fetch manager data
-        manager_data = asst.fetcher.fetch_manager_team(manager_id)
-        picks_data = asst.fetcher.fetch_manager_picks(manager_id, current_gw)
+        # Fetch manager data, picks and history concurrently (independent calls)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            manager_future = executor.submit(asst.fetcher.fetch_manager_team, manager_id)
+            picks_future = executor.submit(asst.fetcher.fetch_manager_picks, manager_id, current_gw)
+            history_future = executor.submit(asst.fetcher.fetch_manager_history, manager_id)
+        
+        manager_data = manager_future.result()
+        picks_data = picks_future.result()
         
-        player_ids = [pick['element'] for pick in picks_data['picks']]
+        player_ids = list(map(itemgetter('element'), picks_data['picks']))
         
         # Try to get history
         try:
-            history = asst.fetcher.fetch_manager_history(manager_id)
-            current_gw_data = None
-            for gw in history['current']:
-                if gw['event'] == current_gw:
-                    current_gw_data = gw
-                    break
+            history = history_future.result()
+            by_event = {gw['event']: gw for gw in history['current']}
+            current_gw_data = by_event.get(current_gw)
             gameweek_points = current_gw_data['points'] if current_gw_data else 0
         except:
             gameweek_points = 0
@@ -105,8 +244,20 @@ def load_team():
         # Save to file
         from datetime import datetime
         asst.my_team['saved_at'] = datetime.now().isoformat()
-        with open(asst.my_team_file, 'w') as f:
-            json.dump(asst.my_team, f, indent=2)
+        # Serialize once, then swap the file in atomically so a crash mid-write
+        # never leaves a truncated team file behind (the temp name is unique,
+        # so concurrent saves cannot clobber each other's temp file)
+        team_json = json.dumps(asst.my_team, indent=2)
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(asst.my_team_file) or '.')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(team_json)
+            # mkstemp files are owner-only; keep the usual readable mode
+            os.chmod(tmp_file, 0o644)
+            os.replace(tmp_file, asst.my_team_file)
+        except Exception:
+            os.remove(tmp_file)
+            raise
         
         return jsonify({
             'success': True,
@@ -114,429 +265,369 @@ def load_team():
             'team': asst.my_team
         })
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"ERROR loading team: {error_trace}")
+        # Only pay for formatting the traceback when debugging
+        if app.debug:
+            print(f"ERROR loading team: {traceback.format_exc()}")
         return jsonify({'success': False, 'error': f'Error: {str(e)}'}), 500
 
 @app.route('/api/my-team', methods=['GET'])
+@json_endpoint
 def my_team():
     """Get current team summary"""
-    try:
-        asst = get_assistant()
-        
-        if asst.my_team is None:
-            return jsonify({
-                'success': False,
-                'error': 'No team saved. Please load your team first.'
-            }), 404
-        
-        team_df = asst.analyzer.players_df[
-            asst.analyzer.players_df['id'].isin(asst.my_team['player_ids'])
-        ].copy()
-        
+    asst = get_assistant()
+    
+    if asst.my_team is None:
         return jsonify({
-            'success': True,
-            'data': {
-                'players': team_df.to_dict('records'),
-                'manager_name': asst.my_team.get('manager_name', 'N/A'),
-                'actual_total_points': asst.my_team.get('total_points', 0),
-                'overall_rank': asst.my_team.get('overall_rank', 0),
-                'gameweek_points': asst.my_team.get('gameweek_points', 0),
-                'total_transfers': asst.my_team.get('total_transfers', 0),
-                'team_value': asst.my_team.get('team_value', float(team_df['price'].sum())),
-                'avg_value_score': float(team_df['value_score'].mean())
-            }
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+            'success': False,
+            'error': 'No team saved. Please load your team first.'
+        }), 404
+    
+    df = asst.analyzer.players_df
+    positions = _player_positions(asst, asst.my_team['player_ids'])
+    
+    # Aggregate straight from the column arrays; the only frame built is the records
+    team_price = float(df['price'].to_numpy()[positions].sum())
+    avg_value_score = float(df['value_score'].to_numpy()[positions].mean()) if len(positions) else float('nan')
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'players': df.iloc[positions].to_dict('records'),
+            'manager_name': asst.my_team.get('manager_name', 'N/A'),
+            'actual_total_points': asst.my_team.get('total_points', 0),
+            'overall_rank': asst.my_team.get('overall_rank', 0),
+            'gameweek_points': asst.my_team.get('gameweek_points', 0),
+            'total_transfers': asst.my_team.get('total_transfers', 0),
+            'team_value': asst.my_team.get('team_value', team_price),
+            'avg_value_score': avg_value_score
+        }
+    })
 
 @app.route('/api/transfer-recommendations', methods=['GET'])
+@json_endpoint
 def transfer_recommendations():
     """Get transfer recommendations"""
-    try:
-        asst = get_assistant()
-        
-        if asst.my_team is None:
-            return jsonify({
-                'success': False,
-                'error': 'No team saved. Please load your team first.'
-            }), 404
-        
-        transfers = int(request.args.get('transfers', 1))
-        result = asst.analyzer.recommend_transfers(
-            asst.my_team['player_ids'],
-            transfers_available=transfers
-        )
-        
+    asst = get_assistant()
+    
+    if asst.my_team is None:
         return jsonify({
-            'success': True,
-            'data': result.to_dict('records') if len(result) > 0 else []
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+            'success': False,
+            'error': 'No team saved. Please load your team first.'
+        }), 404
+    
+    transfers = int(request.args.get('transfers', 1))
+    result = asst.analyzer.recommend_transfers(
+        asst.my_team['player_ids'],
+        transfers_available=transfers
+    )
+    
+    return _records_response(result)
 
 @app.route('/api/captaincy-picks', methods=['GET'])
+@json_endpoint
 def captaincy_picks():
     """Get best captaincy options"""
-    try:
-        asst = get_assistant()
-        top_n = int(request.args.get('top_n', 10))
-        
-        players_df = asst.analyzer.players_df
-        captains = players_df[
-            (players_df['price'] >= 8.0) & 
-            (players_df['status'] == 'a') &
-            (players_df['minutes'] > 450)
-        ].copy()
-        
-        captains['captain_score'] = (
-            captains['form'].astype(float) * 0.4 +
-            captains['points_per_game'].astype(float) * 0.4 +
-            captains['expected_goal_involvements'].astype(float) * 100 * 0.2
-        )
-        
-        best_captains = captains.nlargest(top_n, 'captain_score')
-        
-        return jsonify({
-            'success': True,
-            'data': best_captains.to_dict('records')
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    top_n = int(request.args.get('top_n', 10))
+    
+    _precompute_scores(asst)
+    analyzer = asst.analyzer
+    
+    # Slice the cached ranking instead of scoring and sorting per request
+    top = _top_n(analyzer.captain_sorted_idx, top_n)
+    best_captains = analyzer.players_df.iloc[top].assign(captain_score=analyzer.captain_scores[top])
+    
+    return _records_response(best_captains)
 
 @app.route('/api/differentials', methods=['GET'])
+@json_endpoint
 def differentials():
     """Get differential picks"""
-    try:
-        asst = get_assistant()
-        ownership = float(request.args.get('ownership', 5.0))
-        top_n = int(request.args.get('top_n', 20))
-        
-        df = asst.analyzer.players_df
-        differentials = df[
-            (df['selected_by_percent'].astype(float) <= ownership) &
-            (df['minutes'] > 180) &
-            (df['status'] == 'a')
-        ].nlargest(top_n, 'value_score')
-        
-        return jsonify({
-            'success': True,
-            'data': differentials.to_dict('records')
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    ownership = float(request.args.get('ownership', 5.0))
+    top_n = int(request.args.get('top_n', 20))
+    
+    _precompute_scores(asst)
+    analyzer = asst.analyzer
+    df = analyzer.players_df
+    
+    # Walk the cached value ranking, keeping only low-owned players
+    ranked = analyzer.value_sorted_idx
+    ranked = ranked[df['selected_by_percent'].to_numpy()[ranked] <= ownership]
+    differentials = df.iloc[_top_n(ranked, top_n)]
+    
+    return _records_response(differentials)
 
 @app.route('/api/search-player', methods=['GET'])
+@json_endpoint
 def search_player():
     """Search for a player"""
-    try:
-        asst = get_assistant()
-        name = request.args.get('name', '')
-        
-        if not name:
-            return jsonify({'success': False, 'error': 'Name required'}), 400
-        
-        df = asst.analyzer.players_df
-        results = df[df['web_name'].str.contains(name, case=False, na=False)]
-        
-        return jsonify({
-            'success': True,
-            'data': results.to_dict('records')
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    name = request.args.get('name', '')
+    
+    if not name:
+        return jsonify({'success': False, 'error': 'Name required'}), 400
+    
+    _precompute_lookups(asst)
+    df = asst.analyzer.players_df
+    
+    # Plain substring search over the prebuilt lowercase names
+    mask = np.char.find(asst.analyzer.name_lower, name.lower()) >= 0
+    results = df.iloc[mask]
+    
+    return _records_response(results)
 
 @app.route('/api/compare-players', methods=['POST'])
+@json_endpoint
 def compare_players():
     """Compare multiple players"""
-    try:
-        data = request.json
-        player_ids = data.get('player_ids', [])
-        
-        if not player_ids:
-            return jsonify({'success': False, 'error': 'Player IDs required'}), 400
-        
-        asst = get_assistant()
-        df = asst.analyzer.players_df
-        players = df[df['id'].isin(player_ids)]
-        
-        return jsonify({
-            'success': True,
-            'data': players.to_dict('records')
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    data = request.json
+    player_ids = data.get('player_ids', [])
+    
+    if not player_ids:
+        return jsonify({'success': False, 'error': 'Player IDs required'}), 400
+    
+    asst = get_assistant()
+    df = asst.analyzer.players_df
+    players = df.iloc[_player_positions(asst, player_ids)]
+    
+    return _records_response(players)
 
 # ========== PRICE CHANGE FEATURES ==========
 
 @app.route('/api/price-risers', methods=['GET'])
+@json_endpoint
 def price_risers():
     """Get players likely to rise in price"""
-    try:
-        asst = get_assistant()
-        top_n = int(request.args.get('top_n', 20))
-        result = asst.get_rising_players(top_n)
-        return jsonify({'success': True, 'data': result.to_dict('records')})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    top_n = int(request.args.get('top_n', 20))
+    result = asst.get_rising_players(top_n)
+    return _records_response(result)
 
 @app.route('/api/price-fallers', methods=['GET'])
+@json_endpoint
 def price_fallers():
     """Get players likely to drop in price"""
-    try:
-        asst = get_assistant()
-        top_n = int(request.args.get('top_n', 20))
-        result = asst.get_dropping_players(top_n)
-        return jsonify({'success': True, 'data': result.to_dict('records')})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    top_n = int(request.args.get('top_n', 20))
+    result = asst.get_dropping_players(top_n)
+    return _records_response(result)
 
 @app.route('/api/best-buys-before-rise', methods=['GET'])
+@json_endpoint
 def best_buys_before_rise():
     """Get best value players about to rise"""
-    try:
-        asst = get_assistant()
-        top_n = int(request.args.get('top_n', 15))
-        result = asst.get_best_buys_before_rise(top_n)
-        return jsonify({'success': True, 'data': result.to_dict('records')})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    top_n = int(request.args.get('top_n', 15))
+    result = asst.get_best_buys_before_rise(top_n)
+    return _records_response(result)
 
 @app.route('/api/check-my-prices', methods=['GET'])
+@json_endpoint
 def check_my_prices():
     """Check price changes for my team"""
-    try:
-        asst = get_assistant()
-        if asst.my_team is None:
-            return jsonify({'success': False, 'error': 'No team loaded'}), 404
-        
-        result = asst.check_my_prices()
-        return jsonify({
-            'success': True,
-            'data': {
-                'rising': result['rising'].to_dict('records') if len(result['rising']) > 0 else [],
-                'dropping': result['dropping'].to_dict('records') if len(result['dropping']) > 0 else []
-            }
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    if asst.my_team is None:
+        return jsonify({'success': False, 'error': 'No team loaded'}), 404
+    
+    result = asst.check_my_prices()
+    return jsonify({
+        'success': True,
+        'data': {
+            'rising': result['rising'].to_dict('records') if len(result['rising']) > 0 else [],
+            'dropping': result['dropping'].to_dict('records') if len(result['dropping']) > 0 else []
+        }
+    })
 
 # ========== AI PREDICTION FEATURES ==========
 
 @app.route('/api/ai-predictions', methods=['GET'])
+@json_endpoint
 def ai_predictions():
     """Get AI points predictions"""
-    try:
-        asst = get_assistant()
-        top_n = int(request.args.get('top_n', 30))
-        result = asst.predict_next_gameweek(top_n)
-        return jsonify({'success': True, 'data': result.to_dict('records')})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    cached = _cached_response(asst)
+    if cached is not None:
+        return cached
+    
+    top_n = int(request.args.get('top_n', 30))
+    result = asst.predict_next_gameweek(top_n)
+    return _cache_response(asst, _records_response(result))
 
 @app.route('/api/ai-captain', methods=['GET'])
+@json_endpoint
 def ai_captain():
     """Get AI captain recommendations"""
-    try:
-        asst = get_assistant()
-        result = asst.predict_captain()
-        return jsonify({'success': True, 'data': result.to_dict('records')})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    result = asst.predict_captain()
+    return _records_response(result)
 
 @app.route('/api/ai-differentials', methods=['GET'])
+@json_endpoint
 def ai_differentials():
     """Get AI differential picks"""
-    try:
-        asst = get_assistant()
-        ownership = float(request.args.get('ownership', 5.0))
-        top_n = int(request.args.get('top_n', 15))
-        result = asst.predict_differentials(ownership, top_n)
-        return jsonify({'success': True, 'data': result.to_dict('records')})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    ownership = float(request.args.get('ownership', 5.0))
+    top_n = int(request.args.get('top_n', 15))
+    result = asst.predict_differentials(ownership, top_n)
+    return _records_response(result)
 
 @app.route('/api/ai-value-picks', methods=['GET'])
+@json_endpoint
 def ai_value_picks():
     """Get AI value for money picks"""
-    try:
-        asst = get_assistant()
-        top_n = int(request.args.get('top_n', 20))
-        result = asst.predict_value_picks(top_n)
-        return jsonify({'success': True, 'data': result.to_dict('records')})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    top_n = int(request.args.get('top_n', 20))
+    result = asst.predict_value_picks(top_n)
+    return _records_response(result)
 
 # ========== LIVE TRACKING FEATURES ==========
 
 @app.route('/api/live-team', methods=['GET'])
+@json_endpoint
 def live_team():
     """Get live team points"""
-    try:
-        asst = get_assistant()
-        if asst.my_team is None:
-            return jsonify({'success': False, 'error': 'No team loaded'}), 404
+    asst = get_assistant()
+    if asst.my_team is None:
+        return jsonify({'success': False, 'error': 'No team loaded'}), 404
+    
+    manager_id = asst.my_team.get('manager_id')
+    if not manager_id:
+        return jsonify({'success': False, 'error': 'Manager ID not found'}), 404
         
-        manager_id = asst.my_team.get('manager_id')
-        if not manager_id:
-            return jsonify({'success': False, 'error': 'Manager ID not found'}), 404
-            
-        result = asst.live_tracker.track_my_team_live(manager_id)
-        return jsonify({'success': True, 'data': result})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    result = asst.live_tracker.track_my_team_live(manager_id)
+    return jsonify({'success': True, 'data': result})
 
 @app.route('/api/bonus-system', methods=['GET'])
+@json_endpoint
 def bonus_system():
     """Get current BPS standings"""
-    try:
-        asst = get_assistant()
-        result = asst.show_bps()
-        return jsonify({'success': True, 'data': result.to_dict('records')})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    result = asst.show_bps()
+    return _records_response(result)
 
 @app.route('/api/team-value', methods=['GET'])
+@json_endpoint
 def team_value():
     """Get team value changes"""
-    try:
-        asst = get_assistant()
-        if asst.my_team is None:
-            return jsonify({'success': False, 'error': 'No team loaded'}), 404
-        
-        manager_id = asst.my_team.get('manager_id')
-        result = asst.live_tracker.get_price_change_impact(manager_id)
-        return jsonify({'success': True, 'data': {'value_change': result}})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    if asst.my_team is None:
+        return jsonify({'success': False, 'error': 'No team loaded'}), 404
+    
+    manager_id = asst.my_team.get('manager_id')
+    result = asst.live_tracker.get_price_change_impact(manager_id)
+    return jsonify({'success': True, 'data': {'value_change': result}})
 
 # ========== MINI-LEAGUE SPY FEATURES ==========
 
 @app.route('/api/analyze-league', methods=['POST'])
+@json_endpoint
 def analyze_league():
     """Analyze mini-league standings"""
-    try:
-        asst = get_assistant()
-        data = request.json
-        league_id = data.get('league_id')
-        
-        if not league_id or not asst.my_team:
-            return jsonify({'success': False, 'error': 'League ID and team required'}), 400
-        
-        manager_id = asst.my_team.get('manager_id')
-        result = asst.league_spy.analyze_league(league_id, manager_id)
-        
-        return jsonify({
-            'success': True,
-            'data': result.to_dict('records')
-        })
-    except Exception as e:
-        import traceback
-        print(f"ERROR: {traceback.format_exc()}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    data = request.json
+    league_id = data.get('league_id')
+    
+    if not league_id or not asst.my_team:
+        return jsonify({'success': False, 'error': 'League ID and team required'}), 400
+    
+    manager_id = asst.my_team.get('manager_id')
+    result = asst.league_spy.analyze_league(league_id, manager_id)
+    
+    return _records_response(result)
 
 @app.route('/api/spy-rival', methods=['POST'])
+@json_endpoint
 def spy_rival():
     """Compare against specific rival"""
-    try:
-        asst = get_assistant()
-        data = request.json
-        rival_id = data.get('rival_id')
-        
-        if not rival_id or not asst.my_team:
-            return jsonify({'success': False, 'error': 'Rival ID and team required'}), 400
-        
-        manager_id = asst.my_team.get('manager_id')
-        result = asst.league_spy.compare_vs_rival(manager_id, rival_id)
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'my_differentials': list(result['my_differentials']),
-                'rival_differentials': list(result['rival_differentials']),
-                'shared_players': list(result['shared_players']),
-                'points_difference': result['points_difference']
-            }
-        })
-    except Exception as e:
-        import traceback
-        print(f"ERROR: {traceback.format_exc()}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    data = request.json
+    rival_id = data.get('rival_id')
+    
+    if not rival_id or not asst.my_team:
+        return jsonify({'success': False, 'error': 'Rival ID and team required'}), 400
+    
+    manager_id = asst.my_team.get('manager_id')
+    result = asst.league_spy.compare_vs_rival(manager_id, rival_id)
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'my_differentials': list(result['my_differentials']),
+            'rival_differentials': list(result['rival_differentials']),
+            'shared_players': list(result['shared_players']),
+            'points_difference': result['points_difference']
+        }
+    })
 
 # ========== STATS ==========
 @app.route('/api/team-fixtures', methods=['POST'])
+@json_endpoint
 def team_fixtures():
     """Get fixture analysis for a team"""
-    try:
-        asst = get_assistant()
-        data = request.json
-        team = data.get('team')
-        next_n = int(data.get('next_n', 5))
-        
-        if not team:
-            return jsonify({'success': False, 'error': 'Team required'}), 400
-        
-        result = asst.get_team_fixtures(team, next_n)
-        return jsonify({'success': True, 'data': result.to_dict('records')})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    data = request.json
+    team = data.get('team')
+    next_n = int(data.get('next_n', 5))
+    
+    if not team:
+        return jsonify({'success': False, 'error': 'Team required'}), 400
+    
+    result = asst.get_team_fixtures(team, next_n)
+    return _records_response(result)
 
 @app.route('/api/all-fdr', methods=['GET'])
+@json_endpoint
 def all_fdr():
     """Get FDR for all teams"""
-    try:
-        asst = get_assistant()
-        next_n = int(request.args.get('next_n', 5))
-        result = asst.get_all_fdr(next_n)
-        
-        # Format for JSON
-        formatted = {}
-        for team, data in result.items():
-            formatted[team] = {
-                'avg_fdr': data['avg_fdr'],
-                'fixtures': data['fixtures'].to_dict('records')
-            }
-        
-        return jsonify({'success': True, 'data': formatted})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    cached = _cached_response(asst)
+    if cached is not None:
+        return cached
+    
+    next_n = int(request.args.get('next_n', 5))
+    result = asst.get_all_fdr(next_n)
+    
+    # Format for JSON (fixture tables serialized straight from the columns)
+    formatted = ', '.join([
+        f'{json.dumps(team)}: {{"avg_fdr": {json.dumps(data["avg_fdr"])}, '
+        f'"fixtures": {data["fixtures"].to_json(orient="records", double_precision=15)}}}'
+        for team, data in result.items()
+    ])
+    
+    return _cache_response(asst, Response('{"success": true, "data": {' + formatted + '}}', mimetype='application/json'))
 
 @app.route('/api/analyze-match', methods=['POST'])
+@json_endpoint
 def analyze_match():
     """Analyze specific match"""
-    try:
-        asst = get_assistant()
-        data = request.json
-        home_team = data.get('home_team')
-        away_team = data.get('away_team')
-        
-        if not home_team or not away_team:
-            return jsonify({'success': False, 'error': 'Both teams required'}), 400
-        
-        result = asst.analyze_match(home_team, away_team)
-        return jsonify({'success': True, 'data': result})
-    except Exception as e:
-        return jsonify
+    asst = get_assistant()
+    data = request.json
+    home_team = data.get('home_team')
+    away_team = data.get('away_team')
+    
+    if not home_team or not away_team:
+        return jsonify({'success': False, 'error': 'Both teams required'}), 400
+    
+    result = asst.analyze_match(home_team, away_team)
+    return jsonify({'success': True, 'data': result})
 
 @app.route('/api/stats', methods=['GET'])
+@json_endpoint
 def stats():
     """Get overall statistics"""
-    try:
-        asst = get_assistant()
-        current_gw = asst.fetcher.get_current_gameweek()
-        total_players = len(asst.analyzer.players_df)
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'current_gameweek': current_gw,
-                'total_players': total_players,
-                'features_loaded': True
-            }
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    asst = get_assistant()
+    current_gw = asst.fetcher.get_current_gameweek()
+    total_players = len(asst.analyzer.players_df)
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'current_gameweek': current_gw,
+            'total_players': total_players,
+            'features_loaded': True
+        }
+    })
     
     
 
@@ -548,8 +639,12 @@ if __name__ == '__main__':
     print("   http://localhost:5000")
     print("\n⏹  Press Ctrl+C to stop the server")
     print("="*80 + "\n")
-
-
     
+    # Development server by default; for production run the WSGI entry point
+    # under a multi-worker server instead, e.g.
+    #   gunicorn -w 4 --threads 2 --preload wsgi:app
+    debug = os.environ.get('FLASK_DEBUG', '1') != '0'
+    if not debug:
+        print("⚠️  Debug off - for production use: gunicorn -w 4 --threads 2 --preload wsgi:app\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=debug, host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file
@@ -6,51 +6,23 @@ Add these to your FPLPlayerAnalyzer class for competitive advantage
 import pandas as pd
 import numpy as np
 from fpl_data_fetcher import FPLDataFetcher
+from fpl_player_analyzer import largest_positions
 
 class FPLAdvancedAnalyzer:
     def __init__(self, analyzer):
         """Initialize with existing analyzer"""
         self.analyzer = analyzer
         self.fetcher = analyzer.fetcher
+        self._fixture_runs = {}
+        self._fixture_runs_fixtures = None
+        self._fixture_runs_players = None
         
     def get_fixture_run_analysis(self, next_n_gameweeks=5):
         """
         Analyze which teams have the best fixture runs
         Returns teams sorted by easiest upcoming fixtures
         """
-        fixtures_df = self.analyzer.fixtures_df
-        players_df = self.analyzer.players_df
-        
-        # Get upcoming fixtures only
-        upcoming = fixtures_df[fixtures_df['finished'] == False].copy()
-        
-        # Calculate average difficulty for each team
-        team_fixtures = {}
-        
-        for team in players_df['team_short'].unique():
-            team_games = upcoming[
-                (upcoming['home_team'] == team) | (upcoming['away_team'] == team)
-            ].head(next_n_gameweeks)
-            
-            if len(team_games) > 0:
-                # Get FDR ratings
-                home_fdr = team_games[team_games['home_team'] == team]['team_h_difficulty'].mean()
-                away_fdr = team_games[team_games['away_team'] == team]['team_a_difficulty'].mean()
-                avg_fdr = np.nanmean([home_fdr, away_fdr])
-                
-                # Count home games (home advantage)
-                home_count = len(team_games[team_games['home_team'] == team])
-                
-                team_fixtures[team] = {
-                    'team': team,
-                    'avg_difficulty': avg_fdr if not np.isnan(avg_fdr) else 3,
-                    'fixtures': len(team_games),
-                    'home_games': home_count,
-                    'away_games': len(team_games) - home_count
-                }
-        
-        fixtures_analysis = pd.DataFrame(team_fixtures.values())
-        fixtures_analysis = fixtures_analysis.sort_values('avg_difficulty')
+        fixtures_analysis = self._fixture_run_table(next_n_gameweeks).copy()
         
         print(f"\n{'='*80}")
         print(f"BEST FIXTURE RUNS - NEXT {next_n_gameweeks} GAMEWEEKS")
@@ -60,6 +32,50 @@ class FPLAdvancedAnalyzer:
         
         return fixtures_analysis
     
+    def _fixture_run_table(self, next_n_gameweeks):
+        """Fixture run table for the next N gameweeks, built once per data load"""
+        fixtures_df = self.analyzer.fixtures_df
+        players_df = self.analyzer.players_df
+        
+        # Start over whenever either frame has been reloaded
+        if self._fixture_runs_fixtures is not fixtures_df or self._fixture_runs_players is not players_df:
+            self._fixture_runs = {}
+            self._fixture_runs_fixtures = fixtures_df
+            self._fixture_runs_players = players_df
+        if next_n_gameweeks in self._fixture_runs:
+            return self._fixture_runs[next_n_gameweeks]
+        
+        # Get upcoming fixtures only
+        upcoming = fixtures_df[fixtures_df['finished'] == False]
+        
+        # One row per team side in fixture order, cut to each team's next N games
+        sides = pd.concat([
+            pd.DataFrame({'team': upcoming['home_team'], 'difficulty': upcoming['team_h_difficulty'], 'is_home': 1}),
+            pd.DataFrame({'team': upcoming['away_team'], 'difficulty': upcoming['team_a_difficulty'], 'is_home': 0})
+        ]).sort_index(kind='stable')
+        sides = sides.groupby('team', sort=False).head(next_n_gameweeks)
+        
+        # Average the home and away FDR means (either may be missing), and
+        # count games and home games (home advantage) per team
+        venue_fdr = sides.groupby(['team', 'is_home'])['difficulty'].mean().unstack()
+        counts = sides.groupby('team').agg(fixtures=('difficulty', 'size'), home_games=('is_home', 'sum'))
+        
+        # Teams in player order, skipping teams without upcoming games
+        teams = [team for team in players_df['team_short'].unique() if team in counts.index]
+        counts = counts.reindex(teams)
+        
+        fixtures_analysis = pd.DataFrame({
+            'team': teams,
+            'avg_difficulty': venue_fdr.mean(axis=1).reindex(teams).fillna(3).to_numpy(),
+            'fixtures': counts['fixtures'].to_numpy(),
+            'home_games': counts['home_games'].to_numpy(),
+            'away_games': (counts['fixtures'] - counts['home_games']).to_numpy()
+        })
+        fixtures_analysis = fixtures_analysis.sort_values('avg_difficulty')
+        
+        self._fixture_runs[next_n_gameweeks] = fixtures_analysis
+        return fixtures_analysis
+    
     def get_captaincy_picks(self, top_n=10):
         """
         Best captaincy options based on:
@@ -68,30 +84,24 @@ class FPLAdvancedAnalyzer:
         - Home/Away
         - Historical ceiling
         """
-        players_df = self.analyzer.players_df.copy()
-        fixtures_df = self.analyzer.fixtures_df
+        players_df = self.analyzer.players_df
         
-        # Get next gameweek fixtures
-        next_fixtures = fixtures_df[
-            (fixtures_df['finished'] == False) & 
-            (fixtures_df['event'] == fixtures_df[fixtures_df['finished'] == False]['event'].min())
-        ]
-        
-        # Calculate captaincy score
-        players_df['captaincy_score'] = (
-            players_df['form'].astype(float) * 0.4 +
-            players_df['points_per_game'].astype(float) * 0.3 +
-            players_df['expected_goal_involvements'].astype(float) * 100 * 0.3
-        )
+        # Calculate captaincy score in one pass over the raw arrays
+        form = players_df['form'].to_numpy(dtype=float)
+        ppg = players_df['points_per_game'].to_numpy(dtype=float)
+        xgi = players_df['expected_goal_involvements'].to_numpy(dtype=float)
+        captaincy_score = form * 0.4 + ppg * 0.3 + xgi * 100 * 0.3
         
         # Filter premium players (typically captain picks)
-        captain_candidates = players_df[
-            (players_df['price'] >= 8.0) & 
-            (players_df['status'] == 'a') &
-            (players_df['minutes'] > 450)
-        ].copy()
+        eligible = (
+            (players_df['price'].to_numpy() >= 8.0) & 
+            (players_df['status'].to_numpy() == 'a') &
+            (players_df['minutes'].to_numpy() > 450)
+        )
+        captain_candidates = players_df[eligible].copy()
+        captain_candidates['captaincy_score'] = captaincy_score[eligible]
         
-        best_captains = captain_candidates.nlargest(top_n, 'captaincy_score')
+        best_captains = captain_candidates.iloc[largest_positions(captain_candidates['captaincy_score'], top_n)]
         
         print(f"\n{'='*80}")
         print(f"TOP {top_n} CAPTAINCY PICKS THIS GAMEWEEK")
@@ -109,11 +119,11 @@ class FPLAdvancedAnalyzer:
         Find players to avoid the template (highly owned players)
         These are alternatives to consider instead of popular picks
         """
-        players_df = self.analyzer.players_df.copy()
+        players_df = self.analyzer.players_df
         
         # Find template players (high ownership)
         template = players_df[
-            players_df['selected_by_percent'].astype(float) >= ownership_threshold
+            players_df['selected_by_percent'] >= ownership_threshold
         ].sort_values('selected_by_percent', ascending=False)
         
         print(f"\n{'='*80}")
@@ -128,47 +138,74 @@ class FPLAdvancedAnalyzer:
         print(f"💎 TEMPLATE BREAKERS - Alternative Picks")
         print(f"{'='*80}")
         
-        breakers = []
-        for _, template_player in template.head(5).iterrows():
-            # Find alternatives ±0.5m
-            alternatives = players_df[
-                (players_df['position'] == template_player['position']) &
-                (players_df['price'] >= template_player['price'] - 0.5) &
-                (players_df['price'] <= template_player['price'] + 0.5) &
-                (players_df['selected_by_percent'].astype(float) < ownership_threshold) &
-                (players_df['status'] == 'a') &
-                (players_df['id'] != template_player['id'])
-            ].nlargest(2, 'value_score')
+        # Nobody above the threshold means nothing to break
+        if template.empty:
+            return pd.DataFrame()
+        
+        # Match the top 5 template players against every low-owned available
+        # player at once: one row per template player, one column per player
+        top_template = template.head(5)
+        position = players_df['position'].to_numpy()
+        price = players_df['price'].to_numpy()
+        player_id = players_df['id'].to_numpy()
+        value_score = players_df['value_score'].to_numpy(dtype=float)
+        candidate = (
+            (players_df['selected_by_percent'].to_numpy() < ownership_threshold) &
+            (players_df['status'].to_numpy() == 'a')
+        )
+        template_price = top_template['price'].to_numpy()[:, None]
+        
+        # Alternatives in the same position within ±0.5m
+        matches = (
+            candidate &
+            (position == top_template['position'].to_numpy()[:, None]) &
+            (price >= template_price - 0.5) &
+            (price <= template_price + 0.5) &
+            (player_id != top_template['id'].to_numpy()[:, None])
+        )
+        
+        breaker_rows = []
+        for (_, template_player), row_matches in zip(top_template.iterrows(), matches):
+            # Two best value scores
+            rows = np.flatnonzero(row_matches)
+            rows = rows[largest_positions(value_score[rows], 2)]
+            alternatives = players_df.iloc[rows]
             
             if len(alternatives) > 0:
                 print(f"\n🔄 Instead of {template_player['web_name']} ({template_player['selected_by_percent']}%):")
                 print(alternatives[['web_name', 'team_short', 'price', 
                                    'form', 'selected_by_percent', 'value_score']].to_string(index=False))
-                breakers.extend(alternatives.to_dict('records'))
+                breaker_rows.append(rows)
         
-        return pd.DataFrame(breakers)
+        # Gather every alternative in one positional lookup
+        if not breaker_rows:
+            return pd.DataFrame()
+        return players_df.iloc[np.concatenate(breaker_rows)].reset_index(drop=True)
     
     def points_prediction_next_gw(self, player_id):
         """
         Predict points for next gameweek using simple model
         Based on: form, fixture difficulty, home/away, xG/xA
         """
-        players_df = self.analyzer.players_df
-        player = players_df[players_df['id'] == player_id].iloc[0]
+        player = self.analyzer.player_rows([player_id])
+        
+        return round(float(self._predicted_points(player)[0]), 1)
+    
+    def _predicted_points(self, players):
+        """Unrounded next gameweek prediction for each row of `players`"""
+        form = players['form'].to_numpy(dtype=float)
         
-        # Base prediction on recent form
-        base_points = float(player['form']) if player['form'] else 2.0
+        # Base prediction on recent form (no form yet counts as 2 points)
+        base_points = np.where(form == 0, 2.0, form)
         
         # Adjust for fixture difficulty (placeholder - needs fixture data)
         fixture_multiplier = 1.0  # Would check next opponent
         
         # Adjust for expected goals/assists
-        xg_boost = float(player['expected_goals']) * 0.5 if player['expected_goals'] else 0
-        xa_boost = float(player['expected_assists']) * 0.3 if player['expected_assists'] else 0
-        
-        predicted = (base_points * fixture_multiplier) + xg_boost + xa_boost
+        xg_boost = players['expected_goals'].to_numpy(dtype=float) * 0.5
+        xa_boost = players['expected_assists'].to_numpy(dtype=float) * 0.3
         
-        return round(predicted, 1)
+        return (base_points * fixture_multiplier) + xg_boost + xa_boost
     
     def mini_league_strategy(self, my_team_ids, rival_team_ids):
         """
@@ -177,12 +214,15 @@ class FPLAdvancedAnalyzer:
         """
         players_df = self.analyzer.players_df
         
-        my_team = players_df[players_df['id'].isin(my_team_ids)]
-        rival_team = players_df[players_df['id'].isin(rival_team_ids)]
+        # One membership pass per squad; differentials come from the masks
+        mine = players_df['id'].isin(my_team_ids).to_numpy()
+        rivals = players_df['id'].isin(rival_team_ids).to_numpy()
+        my_team = players_df[mine]
+        rival_team = players_df[rivals]
         
         # Find differential picks (players you have that rival doesn't)
-        my_differentials = my_team[~my_team['id'].isin(rival_team_ids)]
-        rival_differentials = rival_team[~rival_team['id'].isin(my_team_ids)]
+        my_differentials = players_df[mine & ~rivals]
+        rival_differentials = players_df[rivals & ~mine]
         
         print(f"\n{'='*80}")
         print(f"⚔️  MINI-LEAGUE HEAD-TO-HEAD ANALYSIS")
@@ -211,8 +251,8 @@ class FPLAdvancedAnalyzer:
         
         # Identify risky rival picks you should consider covering
         high_threat = rival_differentials[
-            (rival_differentials['form'].astype(float) > 6.0) |
-            (rival_differentials['value_score'] > 0.7)
+            (rival_differentials['form'].to_numpy() > 6.0) |
+            (rival_differentials['value_score'].to_numpy() > 0.7)
         ]
         
         if len(high_threat) > 0:
@@ -232,7 +272,7 @@ class FPLAdvancedAnalyzer:
         Build optimal team for Wildcard chip
         Focuses on fixture runs, form, and value
         """
-        players_df = self.analyzer.players_df.copy()
+        players_df = self.analyzer.players_df
         
         print(f"\n{'='*80}")
         print(f"🃏 WILDCARD TEAM OPTIMIZER")
@@ -244,47 +284,44 @@ class FPLAdvancedAnalyzer:
         good_fixture_teams = fixture_analysis.head(8)['team'].tolist()
         
         # Boost value score for players from teams with good fixtures
-        players_df['wildcard_score'] = players_df['value_score'].copy()
-        players_df.loc[
-            players_df['team_short'].isin(good_fixture_teams), 
-            'wildcard_score'
-        ] *= 1.2
+        wildcard_score = players_df['value_score'].to_numpy(dtype=np.float32, copy=True)
+        wildcard_score[players_df['team_short'].isin(good_fixture_teams).to_numpy()] *= 1.2
         
-        squad = []
+        squad_idx = []
         remaining_budget = budget
         must_have = must_have_ids if must_have_ids else []
         
         formation = {'GK': 2, 'DEF': 5, 'MID': 5, 'FWD': 3}
         
+        # Column arrays for the greedy picks; unavailable and already picked
+        # players are cleared from the available mask
+        position_vec = players_df['position'].to_numpy()
+        price_vec = players_df['price'].to_numpy()
+        score_vec = np.nan_to_num(wildcard_score, nan=-np.inf)
+        available = players_df['status'].to_numpy() == 'a'
+        
         # First add must-have players
         if must_have:
-            must_have_players = players_df[players_df['id'].isin(must_have)]
-            for _, player in must_have_players.iterrows():
-                squad.append(player)
-                remaining_budget -= player['price']
-                formation[player['position']] -= 1
-        
-        # Fill remaining positions
+            must_have_mask = players_df['id'].isin(must_have).to_numpy()
+            available &= ~must_have_mask
+            for i in np.flatnonzero(must_have_mask):
+                squad_idx.append(i)
+                remaining_budget -= price_vec[i]
+                formation[position_vec[i]] -= 1
+        
+        # Fill remaining positions with the best affordable player each time
         for position, count in formation.items():
-            if count <= 0:
-                continue
-                
-            position_players = players_df[
-                (players_df['position'] == position) &
-                (players_df['status'] == 'a') &
-                (~players_df['id'].isin([p['id'] for p in squad]))
-            ].sort_values('wildcard_score', ascending=False)
-            
-            selected = 0
-            for _, player in position_players.iterrows():
-                if selected >= count:
+            position_mask = available & (position_vec == position)
+            for _ in range(count):
+                mask = position_mask & (price_vec <= remaining_budget)
+                best = np.where(mask, score_vec, -np.inf).argmax()
+                if not mask[best]:
                     break
-                if player['price'] <= remaining_budget:
-                    squad.append(player)
-                    remaining_budget -= player['price']
-                    selected += 1
+                squad_idx.append(best)
+                position_mask[best] = False
+                remaining_budget -= price_vec[best]
         
-        squad_df = pd.DataFrame(squad)
+        squad_df = players_df.iloc[squad_idx].assign(wildcard_score=wildcard_score[squad_idx])
         
         print(f"\nTotal Cost: £{squad_df['price'].sum():.1f}m")
         print(f"Remaining: £{remaining_budget:.1f}m")
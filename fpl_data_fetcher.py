@@ -3,27 +3,104 @@ FPL Data Fetcher - Fetches all necessary data from official FPL API
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import json
+import os
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from contextlib import closing
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
 
+# One pooled session shared by every fetcher, so back-to-back API calls
+# reuse the same keep-alive connections to the FPL servers
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=20, pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+# Seconds a fetched bootstrap/fixtures payload is reused before refetching
+CACHE_TTL = 300
+
+# Optional SQLite file that keeps responses which can no longer change
+# (picks of finished gameweeks) across runs; unset means no disk cache
+CACHE_FILE = os.environ.get('FPL_CACHE_FILE')
+
+# Manager picks kept in memory at once (a few whole mini-leagues' worth)
+PICKS_CACHE_SIZE = 1024
+
+class ResponseCache:
+    """
+    Bounded, thread-safe store of fetched payloads by key
+    Entries older than the reader's ttl are dropped on read, and the least
+    recently used ones once there are more than maxsize
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, ttl):
+        """Payload stored under key less than `ttl` seconds ago, or None"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            if time.time() - cached[1] >= ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return cached[0]
+    
+    def put(self, key, payload):
+        """Store a freshly fetched payload, evicting the oldest entries past maxsize"""
+        with self._lock:
+            self._entries[key] = (payload, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
 class FPLDataFetcher:
-    def __init__(self):
+    def __init__(self, cache_file=CACHE_FILE):
         self.base_url = "https://fantasy.premierleague.com/api/"
-        self.session = requests.Session()
+        self.session = SESSION
+        self._bootstrap = None
+        self._bootstrap_ts = 0
+        self._bootstrap_etag = None
+        self._fixtures = None
+        self._fixtures_ts = 0
+        self._picks = ResponseCache(PICKS_CACHE_SIZE)
+        
+        self.cache_file = cache_file
+        if cache_file:
+            with closing(sqlite3.connect(cache_file)) as conn, conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, payload TEXT)")
         
-    def fetch_bootstrap_data(self):
+    def fetch_bootstrap_data(self, ttl=CACHE_TTL):
         """
         Fetch the main bootstrap-static data containing:
         - All players
         - All teams
         - Game settings
         - Current gameweek info
+        
+        The payload is reused for `ttl` seconds (pass ttl=0 to force a refetch)
         """
+        if self._bootstrap is not None and time.time() - self._bootstrap_ts < ttl:
+            return self._bootstrap
+        
         url = f"{self.base_url}bootstrap-static/"
         response = self.session.get(url)
-        return response.json()
+        self._bootstrap = response.json()
+        self._bootstrap_ts = time.time()
+        self._bootstrap_etag = response.headers.get('ETag')
+        return self._bootstrap
     
     def fetch_player_details(self, player_id):
         """Fetch detailed data for a specific player"""
@@ -31,11 +108,16 @@ class FPLDataFetcher:
         response = self.session.get(url)
         return response.json()
     
-    def fetch_fixtures(self):
-        """Fetch all fixtures data"""
+    def fetch_fixtures(self, ttl=CACHE_TTL):
+        """Fetch all fixtures data (reused for `ttl` seconds)"""
+        if self._fixtures is not None and time.time() - self._fixtures_ts < ttl:
+            return self._fixtures
+        
         url = f"{self.base_url}fixtures/"
         response = self.session.get(url)
-        return response.json()
+        self._fixtures = response.json()
+        self._fixtures_ts = time.time()
+        return self._fixtures
     
     def fetch_manager_team(self, manager_id):
         """Fetch a specific manager's team"""
@@ -49,11 +131,70 @@ class FPLDataFetcher:
         response = self.session.get(url)
         return response.json()
     
-    def fetch_manager_picks(self, manager_id, gameweek):
-        """Fetch manager's picks for a specific gameweek"""
+    def fetch_manager_picks(self, manager_id, gameweek, ttl=CACHE_TTL):
+        """Fetch manager's picks for a specific gameweek (reused for `ttl` seconds)"""
+        cached = self._picks.get((manager_id, gameweek), ttl)
+        if cached is not None:
+            return cached
+        
         url = f"{self.base_url}entry/{manager_id}/event/{gameweek}/picks/"
+        
+        # Picks are final once the gameweek is finished, so those can come from disk
+        if self.cache_file and self._gameweek_finished(gameweek):
+            data = self._persistent_get(url)
+        else:
+            data = self.session.get(url).json()
+        
+        # Error payloads are not kept, so they get retried on the next call
+        if 'picks' in data:
+            self._picks.put((manager_id, gameweek), data)
+        return data
+    
+    def _gameweek_finished(self, gameweek):
+        """Whether the bootstrap marks `gameweek` as finished"""
+        events = self.fetch_bootstrap_data()['events']
+        return any(event['id'] == gameweek and event['finished'] for event in events)
+    
+    def _persistent_get(self, url):
+        """GET a JSON payload through the cache_file, storing it on first fetch"""
+        with closing(sqlite3.connect(self.cache_file)) as conn:
+            row = conn.execute("SELECT payload FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is not None:
+            return json.loads(row[0])
+        
         response = self.session.get(url)
-        return response.json()
+        data = response.json()
+        
+        # Only successful responses are kept, so errors get retried next time
+        if response.status_code == 200:
+            with closing(sqlite3.connect(self.cache_file)) as conn, conn:
+                conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?)", (url, json.dumps(data)))
+        return data
+    
+    def fetch_manager_picks_bulk(self, pairs, max_workers=16, raise_errors=False):
+        """
+        Fetch picks for many (manager_id, gameweek) pairs in parallel
+        Results come back in the same order, with None where a request failed
+        (or the first failure is raised, with raise_errors=True)
+        """
+        def fetch(pair):
+            try:
+                return self.fetch_manager_picks(*pair)
+            except Exception:
+                if raise_errors:
+                    raise
+                return None
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch, pairs))
+    
+    def fetch_manager_picks_batch(self, manager_ids, gameweek, max_workers=16, raise_errors=False):
+        """Fetch one gameweek's picks for many managers, as a {manager_id: picks} dict"""
+        manager_ids = list(manager_ids)
+        all_picks = self.fetch_manager_picks_bulk(
+            [(manager_id, gameweek) for manager_id in manager_ids], max_workers, raise_errors
+        )
+        return dict(zip(manager_ids, all_picks))
     
     def get_all_players_df(self):
         """Get all players as a pandas DataFrame with relevant stats"""
@@ -84,6 +225,17 @@ class FPLDataFetcher:
         available_cols = [col for col in important_cols if col in players.columns]
         players_clean = players[available_cols].copy()
         
+        # The API sends these stats as decimal strings; convert them once here
+        # so every consumer works with numeric columns
+        numeric_cols = [
+            'points_per_game', 'selected_by_percent', 'form', 'influence',
+            'creativity', 'threat', 'ict_index', 'expected_goals', 'expected_assists',
+            'expected_goal_involvements', 'expected_goals_conceded',
+            'chance_of_playing_next_round'
+        ]
+        numeric_cols = [col for col in numeric_cols if col in players_clean.columns]
+        players_clean[numeric_cols] = players_clean[numeric_cols].apply(pd.to_numeric, errors='coerce')
+        
         # Convert price from tenths to actual price
         players_clean['price'] = players_clean['now_cost'] / 10
         
@@ -122,14 +274,50 @@ class FPLDataFetcher:
         data = {
             'bootstrap': self.fetch_bootstrap_data(),
             'fixtures': self.fetch_fixtures(),
+            'etag': self._bootstrap_etag,
             'timestamp': datetime.now().isoformat()
         }
         
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Write to a unique temp file and swap it in, so a reader never sees
+        # half a file and concurrent saves cannot clobber each other
+        fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(filename) or '.')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            # mkstemp files are owner-only; keep the usual readable mode
+            os.chmod(tmp_filename, 0o644)
+            os.replace(tmp_filename, filename)
+        except Exception:
+            os.remove(tmp_filename)
+            raise
         
         print(f"Data saved to {filename}")
         return data
+    
+    def load_data_locally(self, filename='fpl_data.json'):
+        """
+        Reuse data saved by save_data_locally while the API still serves the
+        same bootstrap version (checked with a HEAD request on its ETag)
+        Returns the saved data, or None if it is missing or out of date
+        """
+        try:
+            with open(filename) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if not data.get('etag'):
+            return None
+        response = self.session.head(f"{self.base_url}bootstrap-static/")
+        if response.headers.get('ETag') != data['etag']:
+            return None
+        
+        # Seed the in-memory caches so the DataFrame builders skip the network
+        now = time.time()
+        self._bootstrap, self._bootstrap_ts = data['bootstrap'], now
+        self._bootstrap_etag = data['etag']
+        self._fixtures, self._fixtures_ts = data['fixtures'], now
+        return data
 
 
 # Example usage
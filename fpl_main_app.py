@@ -4,10 +4,12 @@ Complete system for team selection and transfer recommendations
 """
 
 from fpl_data_fetcher import FPLDataFetcher
-from fpl_player_analyzer import FPLPlayerAnalyzer
+from fpl_player_analyzer import FPLPlayerAnalyzer, largest_positions
 from fpl_advanced_features import FPLAdvancedAnalyzer
 import pandas as pd
+import numpy as np
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 class FPLAssistant:
@@ -17,6 +19,12 @@ class FPLAssistant:
         self.advanced = None
         self.my_team_file = 'my_fpl_team.json'
         self.my_team = None
+        self._id_to_pos = {}
+        self._names_lower = None
+        self._active_df = None
+        self._squad_order = None
+        self._arrays = None
+        self._lookups_source = None
         
     def initialize(self):
         """Initialize the system by loading data"""
@@ -47,6 +55,50 @@ class FPLAssistant:
         print("  • Wildcard Planner")
         print("  • Bench Boost Optimizer")
         
+    def _refresh_lookups(self):
+        """Build the id index, names, active view and column arrays once per players_df refresh"""
+        df = self.analyzer.players_df
+        if self._lookups_source is df:
+            return
+        
+        self._id_to_pos = {pid: i for i, pid in enumerate(df['id'].to_numpy())}
+        self._names_lower = df['web_name'].fillna('').str.lower().to_numpy(dtype=str)
+        self._active_df = df[(df['status'] == 'a') & (df['minutes'] > 180)]
+        
+        # Display order for squads: position (category order), then price high to low
+        self._squad_order = df['position'].cat.codes.to_numpy(dtype=np.int64) * 10000 - df['now_cost'].to_numpy(dtype=np.int64)
+        
+        # Packed numeric columns for the menu filters and scores
+        self._arrays = {
+            col: df[col].to_numpy(dtype=float)
+            for col in ('form', 'points_per_game', 'expected_goal_involvements',
+                        'price', 'minutes', 'selected_by_percent')
+        }
+        self._arrays['available'] = (df['status'] == 'a').to_numpy()
+        self._lookups_source = df
+    
+    def player_arrays(self):
+        """Column arrays aligned with players_df rows (plus an 'available' status mask)"""
+        self._refresh_lookups()
+        return self._arrays
+    
+    def active_players(self):
+        """Available players with more than 180 minutes (shared by the differential/budget views)"""
+        self._refresh_lookups()
+        return self._active_df
+    
+    def _player_rows(self, player_ids):
+        """Row positions of the given player ids, in players_df order (unknown ids skipped)"""
+        self._refresh_lookups()
+        return sorted({self._id_to_pos[pid] for pid in player_ids if pid in self._id_to_pos})
+    
+    def _team_details(self, player_ids):
+        """Saved-team player records, zipped straight from the column arrays"""
+        team = self.analyzer.players_df.iloc[self._player_rows(player_ids)]
+        cols = ['id', 'web_name', 'team_short', 'position', 'price']
+        columns = [team[col].to_numpy().tolist() for col in cols]
+        return [dict(zip(cols, row)) for row in zip(*columns)]
+    
     def show_best_players(self, position=None, top_n=15):
         """Show best players overall or by position"""
         print(f"\n{'='*80}")
@@ -74,9 +126,7 @@ class FPLAssistant:
             return
         
         # Get player details
-        team_details = self.analyzer.players_df[
-            self.analyzer.players_df['id'].isin(player_ids)
-        ][['id', 'web_name', 'team_short', 'position', 'price']].to_dict('records')
+        team_details = self._team_details(player_ids)
         
         self.my_team = {
             'player_ids': player_ids,
@@ -98,27 +148,24 @@ class FPLAssistant:
             gameweek = self.fetcher.get_current_gameweek()
         
         try:
-            # Fetch manager data
-            manager_data = self.fetcher.fetch_manager_team(manager_id)
+            # Fetch manager data, team picks and history (for actual points)
+            # concurrently over the shared session
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                manager_future = executor.submit(self.fetcher.fetch_manager_team, manager_id)
+                picks_future = executor.submit(self.fetcher.fetch_manager_picks, manager_id, gameweek)
+                history_future = executor.submit(self.fetcher.fetch_manager_history, manager_id)
             
-            # Fetch team picks
-            picks_data = self.fetcher.fetch_manager_picks(manager_id, gameweek)
+            manager_data = manager_future.result()
+            picks_data = picks_future.result()
             player_ids = [pick['element'] for pick in picks_data['picks']]
-            
-            # Fetch history to get actual points
-            history = self.fetcher.fetch_manager_history(manager_id)
+            history = history_future.result()
             
             # Get current gameweek data
-            current_gw_data = None
-            for gw in history['current']:
-                if gw['event'] == gameweek:
-                    current_gw_data = gw
-                    break
+            by_event = {gw['event']: gw for gw in history['current']}
+            current_gw_data = by_event.get(gameweek)
             
             # Get player details
-            team_details = self.analyzer.players_df[
-                self.analyzer.players_df['id'].isin(player_ids)
-            ][['id', 'web_name', 'team_short', 'position', 'price']].to_dict('records')
+            team_details = self._team_details(player_ids)
             
             self.my_team = {
                 'player_ids': player_ids,
@@ -162,8 +209,11 @@ class FPLAssistant:
     
     def search_player(self, name):
         """Search for a player by name"""
+        self._refresh_lookups()
         df = self.analyzer.players_df
-        results = df[df['web_name'].str.contains(name, case=False, na=False)]
+        
+        # Plain substring search over the prebuilt lowercase names
+        results = df.iloc[np.char.find(self._names_lower, name.lower()) >= 0]
         
         if len(results) == 0:
             print(f"\nNo players found matching '{name}'")
@@ -182,7 +232,7 @@ class FPLAssistant:
     def compare_players(self, player_ids):
         """Compare multiple players side by side"""
         df = self.analyzer.players_df
-        players = df[df['id'].isin(player_ids)]
+        players = df.iloc[self._player_rows(player_ids)]
         
         if len(players) == 0:
             print("\nNo players found with those IDs")
@@ -207,7 +257,8 @@ class FPLAssistant:
             return None
         
         df = self.analyzer.players_df
-        team_df = df[df['id'].isin(self.my_team['player_ids'])].copy()
+        rows = np.array(self._player_rows(self.my_team['player_ids']), dtype=int)
+        team_df = df.iloc[rows].copy()
         
         print(f"\n{'='*80}")
         print(f"YOUR CURRENT FPL TEAM")
@@ -231,19 +282,17 @@ class FPLAssistant:
         display_cols = ['web_name', 'team_short', 'position', 'price', 'total_points',
                        'form', 'value_score', 'status', 'news']
         
-        print(team_df.sort_values(['position', 'price'], ascending=[True, False])[display_cols].to_string(index=False))
+        sorted_rows = rows[np.argsort(self._squad_order[rows], kind='stable')]
+        print(df.iloc[sorted_rows][display_cols].to_string(index=False))
         
         return team_df
     
     def get_differentials(self, ownership_max=5.0, top_n=20):
         """Find differential players (low ownership, high value)"""
-        df = self.analyzer.players_df
+        df = self.active_players()
         
-        differentials = df[
-            (df['selected_by_percent'].astype(float) <= ownership_max) &
-            (df['minutes'] > 180) &
-            (df['status'] == 'a')
-        ].nlargest(top_n, 'value_score')
+        differentials = df[df['selected_by_percent'] <= ownership_max]
+        differentials = differentials.iloc[largest_positions(differentials['value_score'], top_n)]
         
         print(f"\n{'='*80}")
         print(f"💎 TOP {top_n} DIFFERENTIAL PICKS (≤{ownership_max}% ownership)")
@@ -4,80 +4,127 @@ FPL Player Analyzer - Analyzes players and recommends best picks
 
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
 from fpl_data_fetcher import FPLDataFetcher
 
+
+def largest_positions(scores, n):
+    """
+    Row positions of the n largest scores, largest first (ties keep row order,
+    NaN last), partitioning instead of sorting every row
+    """
+    n = max(n, 0)
+    neg = -np.asarray(scores, dtype=float)
+    if 0 < n < len(neg):
+        kth = np.partition(neg, n - 1)[n - 1]
+        if not np.isnan(kth):
+            rows = np.flatnonzero(neg <= kth)
+            return rows[np.argsort(neg[rows], kind='stable')[:n]]
+    return np.argsort(neg, kind='stable')[:n]
+
+
 class FPLPlayerAnalyzer:
     def __init__(self):
         self.fetcher = FPLDataFetcher()
         self.players_df = None
         self.fixtures_df = None
-        self.scaler = MinMaxScaler()
+        self._fx_idx_source = None
         
     def load_data(self):
         """Load all necessary data"""
         print("Loading FPL data...")
+        # Warm start from save_data_locally's file while the server's bootstrap
+        # ETag still matches it (no-op when there is no saved file)
+        self.fetcher.load_data_locally()
         self.players_df = self.fetcher.get_all_players_df()
+        
+        # Low-cardinality labels as categoricals (filters and groupbys run on codes)
+        for col in ['team_short', 'position', 'status']:
+            self.players_df[col] = self.players_df[col].astype('category')
+        self._cache_player_groups()
+        
         self.fixtures_df = self.fetcher.get_fixtures_df()
         print(f"Loaded {len(self.players_df)} players")
+    
+    def _cache_player_groups(self):
+        """Cache the team list, id index and position masks for the current players_df"""
+        self._id_index = pd.Index(self.players_df['id'])
+        self._teams = tuple(sorted(self.players_df['team_short'].dropna().unique()))
+        self._is_attacker = self.players_df['position'].isin(['MID', 'FWD']).to_numpy()
+        self._is_defender = self.players_df['position'].isin(['GK', 'DEF']).to_numpy()
+        
+    def player_rows(self, player_ids):
+        """players_df rows for `player_ids` in the order given (ids not in players_df are skipped)"""
+        positions = self._id_index.get_indexer(list(player_ids))
+        return self.players_df.iloc[positions[positions >= 0]]
         
     def calculate_value_score(self):
         """Calculate value score for each player"""
-        df = self.players_df.copy()
-        
-        # Filter out players with no minutes
-        df = df[df['minutes'] > 0].copy()
+        # Filter out players with no minutes (the filtered frame is the only copy)
+        df = self.players_df[self.players_df['minutes'] > 0].copy()
         
-        # Convert string percentages to float
-        df['selected_by_percent'] = pd.to_numeric(df['selected_by_percent'], errors='coerce')
-        df['form'] = pd.to_numeric(df['form'], errors='coerce')
-        df['points_per_game'] = pd.to_numeric(df['points_per_game'], errors='coerce')
-        df['ict_index'] = pd.to_numeric(df['ict_index'], errors='coerce')
-        df['expected_goals'] = pd.to_numeric(df['expected_goals'], errors='coerce')
-        df['expected_assists'] = pd.to_numeric(df['expected_assists'], errors='coerce')
-        
-        # Fill NaN values
-        df.fillna(0, inplace=True)
+        # Fill NaN values (numeric columns are already coerced by the fetcher;
+        # categorical labels are left out since 0 is not one of their categories)
+        df.fillna({col: 0 for col in df.columns if df[col].dtype != 'category'}, inplace=True)
         
         # Calculate points per million
         df['points_per_million'] = df['total_points'] / df['price']
-        df['form_per_million'] = df['form'].astype(float) / df['price']
+        df['form_per_million'] = df['form'] / df['price']
         
         # Calculate expected involvement
         df['expected_involvement'] = df['expected_goals'] + df['expected_assists']
         
-        # Normalize key metrics
+        # Normalize key metrics (min-max scaling of every column in one pass,
+        # in float32 since the scores only need a few significant digits)
         metrics = ['points_per_game', 'form', 'points_per_million', 'ict_index', 'expected_involvement']
-        
-        for metric in metrics:
-            if metric in df.columns:
-                df[f'{metric}_normalized'] = self.scaler.fit_transform(df[[metric]])
+        values = df[metrics].to_numpy(dtype=np.float32)
+        col_min = values.min(axis=0)
+        col_range = values.max(axis=0) - col_min
+        normalized = (values - col_min) / np.where(col_range > 0, col_range, 1)
+        df[[f'{metric}_normalized' for metric in metrics]] = normalized
         
         # Calculate composite value score (weighted average)
-        weights = {
-            'points_per_game_normalized': 0.25,
-            'form_normalized': 0.25,
-            'points_per_million_normalized': 0.20,
-            'ict_index_normalized': 0.15,
-            'expected_involvement_normalized': 0.15
-        }
-        
-        df['value_score'] = sum(df[col] * weight for col, weight in weights.items())
+        weights = np.array([0.25, 0.25, 0.20, 0.15, 0.15], dtype=np.float32)
+        value_score = normalized @ weights
         
-        # Penalize for injury/availability
-        df.loc[df['chance_of_playing_next_round'] < 100, 'value_score'] *= 0.5
-        df.loc[df['status'] != 'a', 'value_score'] *= 0.3
+        # Penalize for injury/availability (both penalties stack)
+        penalty = (
+            np.where(df['chance_of_playing_next_round'].to_numpy() < 100, 0.5, 1.0) *
+            np.where(df['status'].to_numpy() != 'a', 0.3, 1.0)
+        ).astype(np.float32)
+        df['value_score'] = value_score * penalty
         
         self.players_df = df
+        self._cache_player_groups()
         return df
     
+    def _upcoming_fixture_index(self):
+        """
+        Positions of each team's unfinished fixtures in fixtures_df, in order.
+        Built once per fixtures_df so team lookups skip the full table scan
+        """
+        if self._fx_idx_source is not self.fixtures_df:
+            fixtures_df = self.fixtures_df
+            upcoming = np.flatnonzero((fixtures_df['finished'] == False).to_numpy())
+            home_teams = fixtures_df['home_team'].to_numpy()[upcoming]
+            away_teams = fixtures_df['away_team'].to_numpy()[upcoming]
+            
+            fx_idx = {}
+            for pos, home, away in zip(upcoming, home_teams, away_teams):
+                fx_idx.setdefault(home, []).append(pos)
+                fx_idx.setdefault(away, []).append(pos)
+            
+            self._fx_idx = {team: np.asarray(positions, dtype=np.int32) for team, positions in fx_idx.items()}
+            self._fx_idx_source = fixtures_df
+        
+        return self._fx_idx
+    
     def get_fixture_difficulty(self, team_name, next_n_games=5):
         """Calculate fixture difficulty for a team over next N games"""
-        upcoming = self.fixtures_df[
-            (self.fixtures_df['finished'] == False) &
-            ((self.fixtures_df['home_team'] == team_name) | 
-             (self.fixtures_df['away_team'] == team_name))
-        ].head(next_n_games)
+        positions = self._upcoming_fixture_index().get(team_name)
+        if positions is None:
+            return 3  # neutral difficulty
+        
+        upcoming = self.fixtures_df.iloc[positions[:next_n_games]]
         
         if len(upcoming) == 0:
             return 3  # neutral difficulty
@@ -86,7 +133,11 @@ class FPLPlayerAnalyzer:
         home_fdr = upcoming[upcoming['home_team'] == team_name]['team_h_difficulty'].mean()
         away_fdr = upcoming[upcoming['away_team'] == team_name]['team_a_difficulty'].mean()
         
-        avg_fdr = np.nanmean([home_fdr, away_fdr])
+        # Mean of the two venue averages, skipping a venue with no games
+        if np.isnan(home_fdr) or np.isnan(away_fdr):
+            avg_fdr = away_fdr if np.isnan(home_fdr) else home_fdr
+        else:
+            avg_fdr = (home_fdr + away_fdr) / 2
         return avg_fdr if not np.isnan(avg_fdr) else 3
     
     def recommend_best_players(self, position=None, top_n=10):
@@ -94,7 +145,7 @@ class FPLPlayerAnalyzer:
         if self.players_df is None or 'value_score' not in self.players_df.columns:
             self.calculate_value_score()
         
-        df = self.players_df.copy()
+        df = self.players_df
         
         if position:
             df = df[df['position'] == position]
@@ -120,7 +171,7 @@ class FPLPlayerAnalyzer:
         if self.players_df is None or 'value_score' not in self.players_df.columns:
             self.calculate_value_score()
         
-        squad = []
+        squad_idx = []
         remaining_budget = budget
         team_counts = {}  # Track players per team
         
@@ -135,30 +186,36 @@ class FPLPlayerAnalyzer:
             position_players = self.players_df[
                 (self.players_df['position'] == position) &
                 (self.players_df['status'] == 'a')
-            ].copy()
+            ]
             
             # Sort by value score
             position_players = position_players.sort_values('value_score', ascending=False)
             
+            # Scan plain arrays instead of building a Series per row with iterrows
+            candidates = zip(
+                position_players.index,
+                position_players['team_short'].to_numpy(),
+                position_players['price'].to_numpy()
+            )
+            
             selected = 0
-            for _, player in position_players.iterrows():
+            for idx, player_team, price in candidates:
                 if selected >= count:
                     break
                 
-                player_team = player['team_short']
                 current_team_count = team_counts.get(player_team, 0)
                 
                 # Check if adding this player violates 3-per-team rule
                 if current_team_count >= 3:
                     continue  # Skip this player
                 
-                if player['price'] <= remaining_budget:
-                    squad.append(player)
-                    remaining_budget -= player['price']
+                if price <= remaining_budget:
+                    squad_idx.append(idx)
+                    remaining_budget -= price
                     team_counts[player_team] = current_team_count + 1
                     selected += 1
         
-        squad_df = pd.DataFrame(squad)
+        squad_df = self.players_df.loc[squad_idx]
         total_cost = squad_df['price'].sum()
         
         print(f"\n{'='*80}")
@@ -187,78 +244,79 @@ class FPLPlayerAnalyzer:
             self.calculate_value_score()
         
         # Get current team
-        current_team = self.players_df[self.players_df['id'].isin(current_team_ids)].copy()
+        current_team = self.players_df[self.players_df['id'].isin(current_team_ids)]
         
-        # Count players per team in current squad
-        team_counts = current_team['team_short'].value_counts().to_dict()
+        # Count players per team in current squad (as labels, so teams with no
+        # players are not listed as zero-count categories)
+        team_counts = current_team['team_short'].astype(str).value_counts().to_dict()
         
         # Get available players (not in current team)
-        available = self.players_df[~self.players_df['id'].isin(current_team_ids)].copy()
+        available = self.players_df[~self.players_df['id'].isin(current_team_ids)]
         
         all_recommendations = []
         
         for position in ['GK', 'DEF', 'MID', 'FWD']:
             current_pos = current_team[current_team['position'] == position]
-            available_pos = available[available['position'] == position]
+            available_pos = available[
+                (available['position'] == position) &
+                (available['status'] == 'a')
+            ]
+            
+            # Candidates best-first, ties in original order (same as nlargest)
+            available_pos = available_pos.iloc[
+                np.argsort(-available_pos['value_score'].to_numpy(), kind='stable')
+            ]
             
             print(f"\n{'='*80}")
             print(f"📊 {position} TRANSFER RECOMMENDATIONS (Top 3)")
             print(f"{'='*80}")
             
-            position_recommendations = []
+            # Compare every current player (rows) with every candidate (columns) at once
+            out_price = current_pos['price'].to_numpy()[:, None]
+            out_score = current_pos['value_score'].to_numpy()[:, None]
+            out_team = current_pos['team_short'].to_numpy()[:, None]
+            in_price = available_pos['price'].to_numpy()[None, :]
+            in_score = available_pos['value_score'].to_numpy()[None, :]
+            in_team = available_pos['team_short'].to_numpy()[None, :]
             
-            for _, current_player in current_pos.iterrows():
-                # Find better replacements within ±1.5m price range
-                price_min = current_player['price'] - 1.5
-                price_max = current_player['price'] + 1.5
-                
-                replacements = available_pos[
-                    (available_pos['price'] >= price_min) &
-                    (available_pos['price'] <= price_max) &
-                    (available_pos['value_score'] > current_player['value_score']) &
-                    (available_pos['status'] == 'a')
-                ].nlargest(100, 'value_score')  # Get more candidates
-                
-                for _, replacement in replacements.iterrows():
-                    # CHECK: 3 players per team rule
-                    replacement_team = replacement['team_short']
-                    current_player_team = current_player['team_short']
-                    
-                    if replacement_team in team_counts:
-                        if replacement_team == current_player_team:
-                            team_count_after = team_counts[replacement_team]
-                        else:
-                            if team_counts[replacement_team] >= 3:
-                                continue
-                            team_count_after = team_counts[replacement_team] + 1
-                    else:
-                        team_count_after = 1
-                    
-                    if team_count_after <= 3:
-                        score_improvement = replacement['value_score'] - current_player['value_score']
-                        position_recommendations.append({
-                            'position': position,
-                            'out': current_player['web_name'],
-                            'out_team': current_player['team_short'],
-                            'out_price': current_player['price'],
-                            'out_score': current_player['value_score'],
-                            'out_form': current_player['form'],
-                            'in': replacement['web_name'],
-                            'in_team': replacement['team_short'],
-                            'in_price': replacement['price'],
-                            'in_score': replacement['value_score'],
-                            'in_form': replacement['form'],
-                            'price_change': replacement['price'] - current_player['price'],
-                            'score_improvement': score_improvement,
-                            'team_count_after': team_count_after
-                        })
+            # Find better replacements within ±1.5m price range (top 100 per player)
+            candidates = (
+                (in_price >= out_price - 1.5) &
+                (in_price <= out_price + 1.5) &
+                (in_score > out_score)
+            )
+            candidates &= np.cumsum(candidates, axis=1) <= 100
             
-            # Get top 3 for this position
-            position_recommendations = sorted(
-                position_recommendations, 
-                key=lambda x: x['score_improvement'], 
-                reverse=True
-            )[:3]
+            # CHECK: 3 players per team rule
+            in_team_count = available_pos['team_short'].map(team_counts).fillna(0).astype(int).to_numpy()[None, :]
+            team_count_after = np.where(in_team == out_team, in_team_count, in_team_count + 1)
+            candidates &= team_count_after <= 3
+            
+            # Get top 3 for this position (stable, so ties keep player/candidate order)
+            score_improvement = in_score - out_score
+            out_rows, in_rows = np.nonzero(candidates)
+            top = np.argsort(-score_improvement[out_rows, in_rows], kind='stable')[:3]
+            
+            position_recommendations = []
+            for i, j in zip(out_rows[top], in_rows[top]):
+                current_player = current_pos.iloc[i]
+                replacement = available_pos.iloc[j]
+                position_recommendations.append({
+                    'position': position,
+                    'out': current_player['web_name'],
+                    'out_team': current_player['team_short'],
+                    'out_price': current_player['price'],
+                    'out_score': current_player['value_score'],
+                    'out_form': current_player['form'],
+                    'in': replacement['web_name'],
+                    'in_team': replacement['team_short'],
+                    'in_price': replacement['price'],
+                    'in_score': replacement['value_score'],
+                    'in_form': replacement['form'],
+                    'price_change': replacement['price'] - current_player['price'],
+                    'score_improvement': score_improvement[i, j],
+                    'team_count_after': int(team_count_after[i, j])
+                })
             
             if position_recommendations:
                 # Display top 3 for this position
@@ -2,7 +2,9 @@
 FPL Analytics - Interactive Menu (Working Version)
 """
 
+import numpy as np
 from fpl_main_app import FPLAssistant
+from fpl_player_analyzer import largest_positions
 
 def print_menu():
     print("\n" + "="*80)
@@ -115,19 +117,22 @@ def main():
                 print("="*80)
                 
                 players_df = assistant.analyzer.players_df
-                captains = players_df[
-                    (players_df['price'] >= 8.0) & 
-                    (players_df['status'] == 'a') &
-                    (players_df['minutes'] > 450)
-                ].copy()
-                
-                captains['captain_score'] = (
-                    captains['form'].astype(float) * 0.4 +
-                    captains['points_per_game'].astype(float) * 0.4 +
-                    captains['expected_goal_involvements'].astype(float) * 100 * 0.2
+                arrays = assistant.player_arrays()
+                rows = np.flatnonzero(
+                    (arrays['price'] >= 8.0) & 
+                    arrays['available'] &
+                    (arrays['minutes'] > 450)
                 )
                 
-                best_captains = captains.nlargest(10, 'captain_score')
+                # Score the candidates in one expression over the packed arrays
+                captain_score = (
+                    arrays['form'][rows] * 0.4 +
+                    arrays['points_per_game'][rows] * 0.4 +
+                    arrays['expected_goal_involvements'][rows] * 100 * 0.2
+                )
+                
+                # Gather only the 10 printed rows from the full frame
+                best_captains = players_df.iloc[rows[largest_positions(captain_score, 10)]]
                 print(best_captains[['web_name', 'team_short', 'position', 'price', 
                                      'form', 'points_per_game', 'selected_by_percent']].to_string(index=False))
                 
@@ -147,7 +152,7 @@ def main():
                 
                 players_df = assistant.analyzer.players_df
                 template = players_df[
-                    players_df['selected_by_percent'].astype(float) >= ownership
+                    assistant.player_arrays()['selected_by_percent'] >= ownership
                 ].sort_values('selected_by_percent', ascending=False)
                 
                 print(f"\n{'='*80}")
@@ -161,12 +166,9 @@ def main():
                 print("💰 BEST BUDGET OPTIONS (Under £6.0m)")
                 print("="*80)
                 
-                players_df = assistant.analyzer.players_df
-                budget = players_df[
-                    (players_df['price'] < 6.0) & 
-                    (players_df['minutes'] > 180) & 
-                    (players_df['status'] == 'a')
-                ].nlargest(20, 'value_score')
+                active = assistant.active_players()
+                budget = active[active['price'] < 6.0]
+                budget = budget.iloc[largest_positions(budget['value_score'], 20)]
                 
                 print(budget[['web_name', 'team_short', 'position', 'price', 
                              'total_points', 'form', 'value_score']].to_string(index=False))
@@ -180,7 +182,8 @@ def main():
                 premium = players_df[
                     (players_df['price'] >= 9.0) & 
                     (players_df['status'] == 'a')
-                ].nlargest(20, 'value_score')
+                ]
+                premium = premium.iloc[largest_positions(premium['value_score'], 20)]
                 
                 print(premium[['web_name', 'team_short', 'position', 'price', 
                               'total_points', 'form', 'points_per_game', 'value_score']].to_string(index=False))
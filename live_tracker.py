@@ -4,25 +4,62 @@ Track your team's points in real-time during matches
 """
 
 import pandas as pd
-import requests
 from datetime import datetime
+from fpl_data_fetcher import ResponseCache
+
+# Seconds a live gameweek payload is reused (FPL refreshes live data about this often)
+LIVE_TTL = 30
+
+# Live payloads kept at once; only the current gameweek's is normally asked for
+LIVE_CACHE_SIZE = 2
+
+# Live stat columns kept per pick, renamed for the team rows
+LIVE_STATS = {
+    'stats_total_points': 'live_points',
+    'stats_minutes': 'minutes',
+    'stats_goals_scored': 'goals',
+    'stats_assists': 'assists',
+    'stats_clean_sheets': 'clean_sheets',
+    'stats_bonus': 'bonus',
+    'stats_bps': 'bps'
+}
 
 class LiveGameweekTracker:
     def __init__(self, fetcher):
         self.fetcher = fetcher
         self.base_url = "https://fantasy.premierleague.com/api/"
+        self._live_cache = ResponseCache(LIVE_CACHE_SIZE)
+        self._players = None
+        self._players_source = None
         
-    def get_live_points(self, gameweek=None):
-        """Get live points for current gameweek"""
+    def get_live_points(self, gameweek=None, ttl=LIVE_TTL):
+        """Get live points for current gameweek (reused for `ttl` seconds)"""
         if gameweek is None:
             gameweek = self.fetcher.get_current_gameweek()
         
+        cached = self._live_cache.get(gameweek, ttl)
+        if cached is not None:
+            return cached
+        
         url = f"{self.base_url}event/{gameweek}/live/"
-        response = requests.get(url)
-        return response.json()
+        response = self.fetcher.session.get(url)
+        live_data = response.json()
+        self._live_cache.put(gameweek, live_data)
+        return live_data
     
-    def track_my_team_live(self, manager_id, gameweek=None):
-        """Track your team's live points"""
+    def _players_df(self):
+        """Bootstrap players indexed by id, rebuilt only when the fetcher refreshes its payload"""
+        bootstrap = self.fetcher.fetch_bootstrap_data()
+        if self._players_source is not bootstrap:
+            players = pd.DataFrame(bootstrap['elements']).set_index('id')
+            for col in ['cost_change_event', 'selected_by_percent']:
+                players[col] = pd.to_numeric(players[col], errors='coerce')
+            self._players = players
+            self._players_source = bootstrap
+        return self._players
+    
+    def _live_team(self, manager_id, gameweek=None):
+        """(gameweek, DataFrame with one row per pick and its live stats)"""
         if gameweek is None:
             gameweek = self.fetcher.get_current_gameweek()
         
@@ -30,61 +67,52 @@ class LiveGameweekTracker:
         picks_data = self.fetcher.fetch_manager_picks(manager_id, gameweek)
         my_picks = picks_data['picks']
         
-        # Get live data
+        # Get live data, one row per player with the stats flattened into columns
         live_data = self.get_live_points(gameweek)
-        live_elements = {elem['id']: elem for elem in live_data['elements']}
+        live_df = pd.json_normalize(live_data['elements'], sep='_')
+        live_df = live_df.reindex(columns=['id'] + list(LIVE_STATS)).rename(columns=LIVE_STATS)
         
         # Get player details
-        bootstrap = self.fetcher.fetch_bootstrap_data()
-        all_players = {p['id']: p for p in bootstrap['elements']}
+        players = self._players_df()
         
-        # Calculate live points
-        team_live = []
-        total_points = 0
+        # Line the picks up with their live stats (players with no live entry score 0)
+        picks_df = pd.DataFrame(my_picks)
+        team_df = picks_df.merge(live_df, left_on='element', right_on='id', how='left')
+        stat_cols = list(LIVE_STATS.values())
+        team_df[stat_cols] = team_df[stat_cols].fillna(0).astype(int)
         
-        for pick in my_picks:
-            player_id = pick['element']
-            player_live = live_elements.get(player_id, {})
-            player_info = all_players.get(player_id, {})
-            
-            # Get live stats
-            stats = player_live.get('stats', {})
-            live_points = stats.get('total_points', 0)
-            
-            # Apply captain multiplier
-            multiplier = pick['multiplier']
-            final_points = live_points * multiplier
-            
-            team_live.append({
-                'name': player_info.get('web_name', 'Unknown'),
-                'position': pick['position'],
-                'is_captain': multiplier == 2,
-                'is_vice': pick['is_vice_captain'],
-                'live_points': live_points,
-                'multiplier': multiplier,
-                'final_points': final_points,
-                'minutes': stats.get('minutes', 0),
-                'goals': stats.get('goals_scored', 0),
-                'assists': stats.get('assists', 0),
-                'clean_sheets': stats.get('clean_sheets', 0),
-                'bonus': stats.get('bonus', 0),
-                'bps': stats.get('bps', 0)
-            })
-            
-            # Only count starting 11
-            if pick['position'] <= 11:
-                total_points += final_points
+        # Apply captain multiplier
+        team_df['name'] = team_df['element'].map(players['web_name']).fillna('Unknown')
+        team_df['is_captain'] = team_df['multiplier'] == 2
+        team_df['is_vice'] = team_df['is_vice_captain']
+        team_df['final_points'] = team_df['live_points'] * team_df['multiplier']
+        
+        return gameweek, team_df[[
+            'element', 'name', 'position', 'is_captain', 'is_vice', 'live_points',
+            'multiplier', 'final_points', 'minutes', 'goals', 'assists',
+            'clean_sheets', 'bonus', 'bps'
+        ]]
+    
+    def _live_summary(self, gameweek, team_df):
+        """The track_my_team_live payload for a live team frame"""
+        # Only count starting 11
+        total_points = int(team_df.loc[team_df['position'] <= 11, 'final_points'].sum())
         
         return {
             'gameweek': gameweek,
             'total_points': total_points,
-            'team': team_live,
+            'team': team_df.to_dict('records'),
             'timestamp': datetime.now().isoformat()
         }
     
+    def track_my_team_live(self, manager_id, gameweek=None):
+        """Track your team's live points"""
+        return self._live_summary(*self._live_team(manager_id, gameweek))
+    
     def display_live_team(self, manager_id, gameweek=None):
         """Display live team with nice formatting"""
-        live_data = self.track_my_team_live(manager_id, gameweek)
+        gameweek, df = self._live_team(manager_id, gameweek)
+        live_data = self._live_summary(gameweek, df)
         
         print(f"\n{'='*100}")
         print(f"⚡ LIVE GAMEWEEK {live_data['gameweek']} TRACKER")
@@ -93,11 +121,10 @@ class LiveGameweekTracker:
         print(f"⏰ Last updated: {datetime.now().strftime('%H:%M:%S')}")
         print(f"\n{'-'*100}")
         
-        df = pd.DataFrame(live_data['team'])
-        
         # Separate starting 11 and bench
-        starting = df[df['position'] <= 11].sort_values('position')
-        bench = df[df['position'] > 11].sort_values('position')
+        is_starter = df['position'] <= 11
+        starting = df[is_starter].sort_values('position')
+        bench = df[~is_starter].sort_values('position')
         
         print("\n⭐ STARTING 11:")
         print(starting[[
@@ -111,7 +138,8 @@ class LiveGameweekTracker:
         ]].to_string(index=False))
         
         # Highlight captain
-        captain = df[df['is_captain']].iloc[0] if len(df[df['is_captain']]) > 0 else None
+        captains = df[df['is_captain']]
+        captain = captains.iloc[0] if len(captains) > 0 else None
         if captain is not None:
             print(f"\n👑 CAPTAIN: {captain['name']} - {captain['final_points']} points (x2)")
         
@@ -125,20 +153,12 @@ class LiveGameweekTracker:
         live_data = self.get_live_points(gameweek)
         
         # Get players with BPS
-        bps_data = []
-        for elem in live_data['elements']:
-            stats = elem.get('stats', {})
-            bps = stats.get('bps', 0)
-            
-            if bps > 0:
-                bps_data.append({
-                    'player_id': elem['id'],
-                    'bps': bps,
-                    'bonus': stats.get('bonus', 0),
-                    'minutes': stats.get('minutes', 0)
-                })
+        live_df = pd.json_normalize(live_data['elements'], sep='_')
+        bps_df = live_df.reindex(columns=['id', 'stats_bps', 'stats_bonus', 'stats_minutes'])
+        bps_df.columns = ['player_id', 'bps', 'bonus', 'minutes']
+        bps_df[['bps', 'bonus', 'minutes']] = bps_df[['bps', 'bonus', 'minutes']].fillna(0).astype(int)
         
-        bps_df = pd.DataFrame(bps_data).sort_values('bps', ascending=False)
+        bps_df = bps_df[bps_df['bps'] > 0].reset_index(drop=True).sort_values('bps', ascending=False)
         
         print(f"\n{'='*80}")
         print(f"🎁 BONUS POINTS SYSTEM (BPS) - LIVE STANDINGS")
@@ -154,15 +174,9 @@ class LiveGameweekTracker:
         picks_data = self.fetcher.fetch_manager_picks(manager_id, current_gw)
         player_ids = [pick['element'] for pick in picks_data['picks']]
         
-        # Get player data
-        bootstrap = self.fetcher.fetch_bootstrap_data()
-        all_players = pd.DataFrame(bootstrap['elements'])
-        
-        my_team = all_players[all_players['id'].isin(player_ids)].copy()
-        
-        # Calculate value changes
-        my_team['cost_change_event'] = pd.to_numeric(my_team['cost_change_event'], errors='coerce')
-        total_change = my_team['cost_change_event'].sum() / 10  # Convert to millions
+        # Calculate value changes (ids missing from the bootstrap count as no change)
+        players = self._players_df()
+        total_change = players['cost_change_event'].reindex(player_ids).sum() / 10  # Convert to millions
         
         print(f"\n{'='*80}")
         print(f"💰 TEAM VALUE TRACKER")
@@ -180,28 +194,18 @@ class LiveGameweekTracker:
     
     def get_differential_performance(self, manager_id):
         """See how your differentials are performing"""
-        live_data = self.track_my_team_live(manager_id)
+        _, team_df = self._live_team(manager_id)
         
-        # Get ownership data
-        bootstrap = self.fetcher.fetch_bootstrap_data()
-        all_players = {p['id']: p for p in bootstrap['elements']}
+        # Get ownership data (players missing from the bootstrap count as unowned)
+        ownership = team_df['element'].map(self._players_df()['selected_by_percent']).fillna(0)
         
-        differentials = []
-        for player in live_data['team']:
-            player_id = next((p['element'] for p in self.fetcher.fetch_manager_picks(
-                manager_id, live_data['gameweek'])['picks'] 
-                if all_players.get(p['element'], {}).get('web_name') == player['name']), None)
-            
-            if player_id:
-                ownership = float(all_players.get(player_id, {}).get('selected_by_percent', 0))
-                
-                if ownership < 10:  # Differential threshold
-                    differentials.append({
-                        'name': player['name'],
-                        'ownership': ownership,
-                        'points': player['final_points'],
-                        'is_captain': player['is_captain']
-                    })
+        is_differential = ownership < 10  # Differential threshold
+        differentials = pd.DataFrame({
+            'name': team_df['name'],
+            'ownership': ownership,
+            'points': team_df['final_points'],
+            'is_captain': team_df['is_captain']
+        })[is_differential].to_dict('records')
         
         if differentials:
             print(f"\n{'='*80}")
@@ -6,31 +6,44 @@ Compare your team against all rivals in your mini-league
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from fpl_data_fetcher import CACHE_TTL, ResponseCache
+
+# Standings pages kept in memory at once
+STANDINGS_CACHE_SIZE = 64
 
 class MiniLeagueSpy:
     def __init__(self, fetcher, analyzer):
         self.fetcher = fetcher
         self.analyzer = analyzer
+        self._standings = ResponseCache(STANDINGS_CACHE_SIZE)
+        
+    def _fetch_standings(self, league_id, page=1, ttl=CACHE_TTL):
+        """One page of league standings (reused for `ttl` seconds across the spy's analyses)"""
+        cached = self._standings.get((league_id, page), ttl)
+        if cached is not None:
+            return cached
         
+        url = f"{self.fetcher.base_url}leagues-classic/{league_id}/standings/?page_standings={page}"
+        data = self.fetcher.session.get(url).json()
+        self._standings.put((league_id, page), data)
+        return data
+    
     def get_league_standings(self, league_id):
         """Get mini-league standings"""
-        url = f"{self.fetcher.base_url}leagues-classic/{league_id}/standings/"
-        response = self.fetcher.session.get(url)
-        return response.json()
+        return self._fetch_standings(league_id)
     
     def get_all_teams_in_league(self, league_id, page=1):
         """Get all teams in a mini-league (handles pagination)"""
-        url = f"{self.fetcher.base_url}leagues-classic/{league_id}/standings/?page_standings={page}"
-        response = self.fetcher.session.get(url)
-        data = response.json()
+        teams = []
         
-        teams = data['standings']['results']
-        
-        # If there are more pages, get them too
-        if data['standings']['has_next']:
-            teams.extend(self.get_all_teams_in_league(league_id, page + 1))
-        
-        return teams
+        # Walk the pages one request at a time until there are no more
+        while True:
+            data = self._fetch_standings(league_id, page)
+            teams.extend(data['standings']['results'])
+            
+            if not data['standings']['has_next']:
+                return teams
+            page += 1
     
     def analyze_league(self, league_id, my_manager_id):
         """Complete analysis of mini-league"""
@@ -76,9 +89,11 @@ class MiniLeagueSpy:
         print(f"⚔️  HEAD-TO-HEAD COMPARISON (GW {gameweek})")
         print(f"{'='*80}")
         
-        # Get both teams
-        my_picks = self.fetcher.fetch_manager_picks(my_manager_id, gameweek)
-        rival_picks = self.fetcher.fetch_manager_picks(rival_manager_id, gameweek)
+        # Get both teams (a failed request is raised, both are needed)
+        both_picks = self.fetcher.fetch_manager_picks_batch(
+            [my_manager_id, rival_manager_id], gameweek, raise_errors=True
+        )
+        my_picks, rival_picks = both_picks[my_manager_id], both_picks[rival_manager_id]
         
         my_player_ids = [pick['element'] for pick in my_picks['picks']]
         rival_player_ids = [pick['element'] for pick in rival_picks['picks']]
@@ -139,7 +154,7 @@ class MiniLeagueSpy:
             
             # Identify high-threat players
             high_threat = rival_diff_players[
-                (rival_diff_players['form'].astype(float) > 6.0) |
+                (rival_diff_players['form'] > 6.0) |
                 (rival_diff_players['value_score'] > 0.6)
             ]
             
@@ -155,8 +170,8 @@ class MiniLeagueSpy:
         rival_captain_id = next((p['element'] for p in rival_picks['picks'] if p['is_captain']), None)
         
         if my_captain_id and rival_captain_id:
-            my_captain = players_df[players_df['id'] == my_captain_id].iloc[0]
-            rival_captain = players_df[players_df['id'] == rival_captain_id].iloc[0]
+            captains = self.analyzer.player_rows([my_captain_id, rival_captain_id])
+            my_captain, rival_captain = captains.iloc[0], captains.iloc[1]
             
             print(f"\n{'='*80}")
             print(f"👑 CAPTAIN COMPARISON")
@@ -176,8 +191,11 @@ class MiniLeagueSpy:
             'points_difference': points_diff
         }
     
-    def analyze_entire_league(self, league_id, my_manager_id):
-        """Analyze your position vs everyone in the league"""
+    def analyze_entire_league(self, league_id, my_manager_id, max_teams=10):
+        """
+        Analyze your position vs everyone in the league
+        Picks are fetched in parallel for the top `max_teams` teams (None = whole league)
+        """
         print(f"\n{'='*80}")
         print(f"🔍 COMPLETE LEAGUE ANALYSIS")
         print(f"{'='*80}")
@@ -192,51 +210,60 @@ class MiniLeagueSpy:
         # Get all team picks
         print("\n⏳ Analyzing all teams (this may take a moment)...")
         
+        top_teams = all_teams[:max_teams]
+        all_picks = self.fetcher.fetch_manager_picks_batch(
+            [team['entry'] for team in top_teams], current_gw
+        )
+        
         league_players = {}
-        for team in all_teams[:10]:  # Limit to top 10 for speed
+        for manager_id, picks in all_picks.items():
             try:
-                manager_id = team['entry']
-                picks = self.fetcher.fetch_manager_picks(manager_id, current_gw)
                 player_ids = [pick['element'] for pick in picks['picks']]
                 league_players[manager_id] = player_ids
             except:
                 continue
         
-        # Find most popular players in the league
-        all_player_ids = []
-        for player_list in league_players.values():
-            all_player_ids.extend(player_list)
-        
-        from collections import Counter
-        player_counts = Counter(all_player_ids)
-        most_common = player_counts.most_common(15)
+        # Find most popular players in the league (ties keep first-seen order)
+        all_player_ids = pd.Series(
+            [pid for player_list in league_players.values() for pid in player_list], dtype='int64'
+        )
+        player_counts = all_player_ids.value_counts(sort=False)
+        most_common = player_counts.sort_values(ascending=False, kind='stable').head(15)
+        template_ids = most_common.index.tolist()
         
         print(f"\n{'='*80}")
         print(f"📊 MINI-LEAGUE TEMPLATE (Most Owned Players)")
         print(f"{'='*80}")
         
+        # Look all template players up in one go, skipping ids missing from players_df
         players_df = self.analyzer.players_df
-        template_data = []
-        
-        for player_id, count in most_common:
-            player = players_df[players_df['id'] == player_id]
-            if len(player) > 0:
-                player = player.iloc[0]
-                ownership_pct = (count / len(league_players)) * 100
-                template_data.append({
-                    'player': player['web_name'],
-                    'team': player['team_short'],
-                    'position': player['position'],
-                    'league_ownership': f"{ownership_pct:.0f}%",
-                    'overall_ownership': f"{player['selected_by_percent']}%"
-                })
+        positions = self.analyzer._id_index.get_indexer(template_ids)
+        found = positions >= 0
+        template_players = players_df.iloc[positions[found]]
+        ownership_pcts = most_common.to_numpy()[found] / len(league_players) * 100
+        
+        template_data = [
+            {
+                'player': name,
+                'team': team,
+                'position': position,
+                'league_ownership': f"{ownership_pct:.0f}%",
+                'overall_ownership': f"{overall}%"
+            }
+            for name, team, position, overall, ownership_pct in zip(
+                template_players['web_name'].tolist(),
+                template_players['team_short'].tolist(),
+                template_players['position'].tolist(),
+                template_players['selected_by_percent'].tolist(),
+                ownership_pcts.tolist()
+            )
+        ]
         
         template_df = pd.DataFrame(template_data)
         print(template_df.to_string(index=False))
         
         # Check if you own the template
         my_players = league_players.get(my_manager_id, [])
-        template_ids = [pid for pid, _ in most_common]
         
         my_template_count = len(set(my_players) & set(template_ids))
         
@@ -5,15 +5,48 @@ Uses machine learning to predict next gameweek points
 
 import pandas as pd
 import numpy as np
+import hashlib
+import os
+import tempfile
+import joblib
+import sklearn
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
+from fpl_player_analyzer import largest_positions
+
+# players_df columns the predictor reads (model inputs, filters and the printed tables)
+PREDICTOR_COLS = [
+    'web_name', 'team_short', 'position', 'status', 'price', 'selected_by_percent',
+    'form', 'points_per_game', 'minutes', 'goals_scored', 'assists', 'expected_goals',
+    'expected_assists', 'ict_index', 'influence', 'creativity', 'threat', 'bonus', 'bps'
+]
+
+# Where the trained model is kept between runs (the models/ directory is gitignored)
+MODEL_FILE = os.path.join('models', 'points_rf.joblib')
+
+def _atomic_write(path, write):
+    """
+    Write a file through a unique temp file swapped in place, so no reader
+    (or concurrent writer) ever sees half of it
+    """
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(path) or '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_file, path)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
 
 class AIPointsPredictor:
-    def __init__(self, analyzer):
+    def __init__(self, analyzer, model_file=MODEL_FILE):
         self.analyzer = analyzer
+        self.model_file = model_file  # None disables saving/reusing the trained model
+        # Single-threaded on purpose: on ~600 rows a joblib pool costs more than
+        # it saves, and the web server already runs several threads and workers
         self.model = RandomForestRegressor(n_estimators=100, random_state=42, max_depth=10)
-        self.scaler = StandardScaler()
         self.is_trained = False
+        self._predictions_source = None
+        self._features_source = None
         
     def prepare_features(self, players_df):
         """Prepare features for ML model"""
@@ -25,29 +58,36 @@ class AIPointsPredictor:
                        'expected_goal_involvements', 'ict_index', 'influence', 
                        'creativity', 'threat', 'bonus', 'bps']
         
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        numeric_cols = [col for col in numeric_cols if col in df.columns]
+        df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
         
-        # Create derived features
-        df['goals_per_90'] = (df['goals_scored'] / (df['minutes'] + 1)) * 90
-        df['assists_per_90'] = (df['assists'] / (df['minutes'] + 1)) * 90
-        df['xg_per_90'] = (df['expected_goals'] / (df['minutes'] + 1)) * 90
-        df['xa_per_90'] = (df['expected_assists'] / (df['minutes'] + 1)) * 90
+        # Create derived features (per-90 rates share one minutes + 1 denominator)
+        minutes = df['minutes'].to_numpy() + 1
+        for col, per_90 in [('goals_scored', 'goals_per_90'), ('assists', 'assists_per_90'),
+                            ('expected_goals', 'xg_per_90'), ('expected_assists', 'xa_per_90')]:
+            df[per_90] = (df[col].to_numpy() / minutes) * 90
         df['form_momentum'] = df['form'] * df['points_per_game']
         
         # Position encoding
         position_map = {'GK': 0, 'DEF': 1, 'MID': 2, 'FWD': 3}
-        df['position_encoded'] = df['position'].map(position_map)
+        df['position_encoded'] = df['position'].map(position_map).astype(int)
         
         return df
     
+    def _features(self, players_df):
+        """
+        prepare_features on just the PREDICTOR_COLS of players_df, shared by
+        training and prediction on the same frame
+        """
+        if self._features_source is not players_df:
+            self._features_df = self.prepare_features(players_df[PREDICTOR_COLS])
+            self._features_source = players_df
+        return self._features_df
+    
     def train_model(self):
         """Train the ML model on historical data (simulated with current form)"""
-        players_df = self.analyzer.players_df.copy()
-        
         # Prepare features
-        df = self.prepare_features(players_df)
+        df = self._features(self.analyzer.players_df)
         
         # Feature columns
         feature_cols = [
@@ -59,7 +99,7 @@ class AIPointsPredictor:
         ]
         
         # Filter valid data
-        valid_data = df[(df['minutes'] > 90) & (df['form'] > 0)].copy()
+        valid_data = df[(df['minutes'] > 90) & (df['form'] > 0)]
         
         if len(valid_data) < 50:
             print("⚠️  Not enough data to train model. Using rule-based predictions.")
@@ -69,21 +109,76 @@ class AIPointsPredictor:
         # Target: predict form (proxy for next gameweek points)
         y = valid_data['form']
         
-        # Train model
-        X_scaled = self.scaler.fit_transform(X)
-        self.model.fit(X_scaled, y)
+        # Trees are scale-invariant, so the raw features go in unscaled;
+        # they split on float32, so hand them over in that dtype and skip sklearn's copy
+        X = X.to_numpy(dtype=np.float32)
+        
+        # Reuse the model saved by an earlier run on identical training data
+        # (and the same sklearn, whose pickles do not carry across versions)
+        data_hash = hashlib.sha256(
+            X.tobytes() + y.to_numpy(dtype=np.float64).tobytes() +
+            repr(sorted(self.model.get_params().items())).encode() +
+            sklearn.__version__.encode()
+        ).hexdigest()
         
         self.is_trained = True
+        self._predictions_source = None
+        
+        if self._load_model(data_hash):
+            print("✅ AI Model loaded (trained on the same data last run)")
+            return True
+        
+        # Train model
+        self.model.fit(X, y)
+        self._save_model(data_hash)
+        
         print("✅ AI Model trained successfully!")
         return True
     
-    def predict_next_gameweek(self, top_n=30):
-        """Predict points for next gameweek"""
-        if not self.is_trained:
-            self.train_model()
-        
-        players_df = self.analyzer.players_df.copy()
-        df = self.prepare_features(players_df)
+    def _load_model(self, data_hash):
+        """Load the saved model if it was trained on data with this hash"""
+        if not self.model_file:
+            return False
+        try:
+            # The hash sidecar is checked first, so a stale forest is never unpickled
+            with open(f"{self.model_file}.sha256") as f:
+                if f.read() != data_hash:
+                    return False
+            saved = joblib.load(self.model_file)
+            # The copy inside the file guards against a sidecar from another writer
+            if saved['data_hash'] != data_hash:
+                return False
+        except Exception:
+            return False  # missing or unreadable: retrain
+        
+        self.model = saved['model']
+        return True
+    
+    def _save_model(self, data_hash):
+        """Save the trained model plus its data hash sidecar"""
+        if not self.model_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.model_file) or '.', exist_ok=True)
+            _atomic_write(self.model_file, lambda f: joblib.dump({'model': self.model, 'data_hash': data_hash}, f))
+            _atomic_write(f"{self.model_file}.sha256", lambda f: f.write(data_hash.encode()))
+        except OSError:
+            pass  # a read-only directory only costs the retrain next run
+    
+    def _all_predictions(self):
+        """
+        Predictions for every active player, rerun only when the analyzer's
+        players_df is replaced or the model is retrained
+        """
+        players_df = self.analyzer.players_df
+        if self._predictions_source is not players_df:
+            self._predictions = self._predict(players_df)
+            self._predictions_source = players_df
+        return self._predictions
+    
+    def _predict(self, players_df):
+        """Run the model over the active players of `players_df`, sorted by predicted points"""
+        df = self._features(players_df)
         
         # Feature columns
         feature_cols = [
@@ -95,88 +190,101 @@ class AIPointsPredictor:
         ]
         
         # Predict only for active players with minutes
-        valid_players = df[
-            (df['status'] == 'a') &
-            (df['minutes'] > 90)
-        ].copy()
+        valid_players = df[(df['status'] == 'a').to_numpy() & (df['minutes'].to_numpy() > 90)]
         
         if len(valid_players) == 0:
-            print("❌ No valid players to predict")
-            return pd.DataFrame()
+            return valid_players
         
-        X = valid_players[feature_cols]
-        X_scaled = self.scaler.transform(X)
+        X = valid_players[feature_cols].to_numpy(dtype=np.float32)
         
         # Predict
-        predictions = self.model.predict(X_scaled)
+        predicted_points = np.clip(self.model.predict(X), 0, 20)
+        
+        # Sort once, best first (stable, so ties keep players_df order like nlargest)
+        order = np.argsort(-predicted_points, kind='stable')
+        
+        return valid_players.assign(
+            predicted_points=predicted_points,
+            # Confidence based on recent form consistency (form above 6 HIGH, above 3 MEDIUM)
+            confidence=pd.cut(
+                valid_players['form'], bins=[-np.inf, 3, 6, np.inf], labels=['LOW', 'MEDIUM', 'HIGH']
+            )
+        ).iloc[order]
+    
+    def predict_next_gameweek(self, top_n=30, verbose=True):
+        """Predict points for next gameweek"""
+        if not self.is_trained:
+            self.train_model()
         
-        valid_players['predicted_points'] = np.clip(predictions, 0, 20)
+        valid_players = self._all_predictions()
         
-        # Confidence based on recent form consistency
-        valid_players['confidence'] = np.where(
-            valid_players['form'] > 6, 'HIGH',
-            np.where(valid_players['form'] > 3, 'MEDIUM', 'LOW')
-        )
+        if len(valid_players) == 0:
+            print("❌ No valid players to predict")
+            return pd.DataFrame()
         
-        # Sort by predicted points
-        top_predictions = valid_players.nlargest(top_n, 'predicted_points')
+        # Predictions are already sorted by predicted points
+        top_predictions = valid_players.head(top_n)
         
         result = top_predictions[[
             'web_name', 'team_short', 'position', 'price', 'form',
             'predicted_points', 'confidence', 'selected_by_percent'
-        ]].copy()
+        ]]
         
-        print(f"\n{'='*80}")
-        print(f"🤖 AI POINTS PREDICTIONS - NEXT GAMEWEEK (Top {top_n})")
-        print(f"{'='*80}")
-        print(result.to_string(index=False))
+        if verbose:
+            print(f"\n{'='*80}")
+            print(f"🤖 AI POINTS PREDICTIONS - NEXT GAMEWEEK (Top {top_n})")
+            print(f"{'='*80}")
+            print(result.to_string(index=False))
         
         return result
     
-    def predict_captain_options(self, top_n=10):
+    def predict_captain_options(self, top_n=10, verbose=True):
         """Best captain picks based on AI predictions"""
-        predictions = self.predict_next_gameweek(top_n=100)
+        predictions = self.predict_next_gameweek(top_n=100, verbose=False)
         
         # Filter premium players (likely captain candidates)
         captains = predictions[predictions['price'] >= 8.0].head(top_n)
         
-        print(f"\n{'='*80}")
-        print(f"👑 AI CAPTAIN RECOMMENDATIONS (Top {top_n})")
-        print(f"{'='*80}")
-        print(captains.to_string(index=False))
+        if verbose:
+            print(f"\n{'='*80}")
+            print(f"👑 AI CAPTAIN RECOMMENDATIONS (Top {top_n})")
+            print(f"{'='*80}")
+            print(captains.to_string(index=False))
         
         return captains
     
-    def predict_differentials(self, ownership_max=5.0, top_n=15):
+    def predict_differentials(self, ownership_max=5.0, top_n=15, verbose=True):
         """High predicted points + low ownership = differentials"""
-        predictions = self.predict_next_gameweek(top_n=200)
+        predictions = self.predict_next_gameweek(top_n=200, verbose=False)
         
         differentials = predictions[
-            predictions['selected_by_percent'].astype(float) <= ownership_max
+            predictions['selected_by_percent'] <= ownership_max
         ].head(top_n)
         
-        print(f"\n{'='*80}")
-        print(f"💎 AI DIFFERENTIAL PICKS (Under {ownership_max}% ownership)")
-        print(f"{'='*80}")
-        print(differentials.to_string(index=False))
+        if verbose:
+            print(f"\n{'='*80}")
+            print(f"💎 AI DIFFERENTIAL PICKS (Under {ownership_max}% ownership)")
+            print(f"{'='*80}")
+            print(differentials.to_string(index=False))
         
         return differentials
     
-    def compare_prediction_vs_price(self, top_n=20):
+    def compare_prediction_vs_price(self, top_n=20, verbose=True):
         """Find best value: high predictions, low price"""
-        predictions = self.predict_next_gameweek(top_n=200)
+        predictions = self.predict_next_gameweek(top_n=200, verbose=False)
         
-        predictions['value_ratio'] = predictions['predicted_points'] / predictions['price']
+        predictions = predictions.assign(value_ratio=predictions['predicted_points'] / predictions['price'])
         
-        best_value = predictions.nlargest(top_n, 'value_ratio')
+        best_value = predictions.iloc[largest_positions(predictions['value_ratio'], top_n)]
         
-        print(f"\n{'='*80}")
-        print(f"💰 BEST VALUE FOR MONEY (Top {top_n})")
-        print(f"{'='*80}")
-        print(best_value[[
-            'web_name', 'team_short', 'position', 'price',
-            'predicted_points', 'value_ratio', 'confidence'
-        ]].to_string(index=False))
+        if verbose:
+            print(f"\n{'='*80}")
+            print(f"💰 BEST VALUE FOR MONEY (Top {top_n})")
+            print(f"{'='*80}")
+            print(best_value[[
+                'web_name', 'team_short', 'position', 'price',
+                'predicted_points', 'value_ratio', 'confidence'
+            ]].to_string(index=False))
         
         return best_value
 
@@ -6,20 +6,36 @@ Predicts which players will rise/drop in price
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from fpl_player_analyzer import largest_positions
 
 class PriceChangePredictor:
     def __init__(self, fetcher):
         self.fetcher = fetcher
         self.threshold_rise = 100  # Net transfers needed for price rise
         self.threshold_drop = -100  # Net transfers needed for price drop
+        self._predictions_source = None
         
     def get_price_change_predictions(self):
         """
         Predict price changes based on ownership trends
         Returns players likely to rise/drop tonight
         """
-        # Get current data
+        return self._predictions().copy()
+    
+    def _predictions(self):
+        """
+        Shared (read-only) prediction frame, rebuilt only when the fetcher
+        hands back a new bootstrap payload (it is itself cached for CACHE_TTL)
+        """
         data = self.fetcher.fetch_bootstrap_data()
+        if self._predictions_source is not data:
+            self._predictions_df = self._build_predictions_df(data)
+            self._best_buy_values = self._build_best_buy_values(self._predictions_df)
+            self._predictions_source = data
+        return self._predictions_df
+    
+    def _build_predictions_df(self, data):
+        """Players frame with net transfers and rise/drop probabilities"""
         players_df = pd.DataFrame(data['elements'])
         teams_df = pd.DataFrame(data['teams'])
         
@@ -28,9 +44,8 @@ class PriceChangePredictor:
         players_df['team_short'] = players_df['team'].map(team_map)
         
         # Calculate price change likelihood
-        players_df['selected_by_percent'] = pd.to_numeric(players_df['selected_by_percent'], errors='coerce')
-        players_df['transfers_in_event'] = pd.to_numeric(players_df['transfers_in_event'], errors='coerce')
-        players_df['transfers_out_event'] = pd.to_numeric(players_df['transfers_out_event'], errors='coerce')
+        numeric_cols = ['selected_by_percent', 'transfers_in_event', 'transfers_out_event']
+        players_df[numeric_cols] = players_df[numeric_cols].apply(pd.to_numeric, errors='coerce')
         
         # Net transfers
         players_df['net_transfers'] = players_df['transfers_in_event'] - players_df['transfers_out_event']
@@ -39,18 +54,11 @@ class PriceChangePredictor:
         players_df['transfer_index'] = (players_df['net_transfers'] / 
                                         (players_df['selected_by_percent'] * 1000 + 1))
         
-        # Price change probability
-        players_df['rise_probability'] = np.where(
-            players_df['transfer_index'] > 0.005, 
-            np.minimum(players_df['transfer_index'] * 100, 100), 
-            0
-        )
-        
-        players_df['drop_probability'] = np.where(
-            players_df['transfer_index'] < -0.005,
-            np.minimum(abs(players_df['transfer_index']) * 100, 100),
-            0
-        )
+        # Price change probability (both directions share the same capped magnitude)
+        transfer_index = players_df['transfer_index'].to_numpy()
+        probability = np.minimum(np.abs(transfer_index) * 100, 100)
+        players_df['rise_probability'] = np.where(transfer_index > 0.005, probability, 0)
+        players_df['drop_probability'] = np.where(transfer_index < -0.005, probability, 0)
         
         # Position names
         position_map = {1: 'GK', 2: 'DEF', 3: 'MID', 4: 'FWD'}
@@ -61,109 +69,117 @@ class PriceChangePredictor:
         
         return players_df
     
-    def get_rising_players(self, top_n=20):
+    def _build_best_buy_values(self, players_df):
+        """Numeric form and the simplified value score used by get_best_buys_before_rise"""
+        form = pd.to_numeric(players_df['form'], errors='coerce')
+        points_per_game = pd.to_numeric(players_df['points_per_game'], errors='coerce')
+        
+        return pd.DataFrame({
+            'form': form,
+            'quick_value': (form.fillna(0) * 0.5 + points_per_game.fillna(0) * 0.5) / players_df['price']
+        })
+    
+    def get_rising_players(self, top_n=20, verbose=True):
         """Get players most likely to rise in price"""
-        df = self.get_price_change_predictions()
+        df = self._predictions()
         
         risers = df[
             (df['rise_probability'] > 30) &
             (df['status'] == 'a')
-        ].nlargest(top_n, 'rise_probability')
+        ]
+        risers = risers.iloc[largest_positions(risers['rise_probability'], top_n)]
         
         result = risers[[
             'web_name', 'team_short', 'position', 'price', 
             'selected_by_percent', 'net_transfers', 'rise_probability'
-        ]].copy()
+        ]].assign(prediction='RISING TONIGHT ⬆️')
         
-        result['prediction'] = 'RISING TONIGHT ⬆️'
-        
-        print(f"\n{'='*80}")
-        print(f"💰 PLAYERS LIKELY TO RISE IN PRICE (Top {top_n})")
-        print(f"{'='*80}")
-        print(result.to_string(index=False))
+        if verbose:
+            print(f"\n{'='*80}")
+            print(f"💰 PLAYERS LIKELY TO RISE IN PRICE (Top {top_n})")
+            print(f"{'='*80}")
+            print(result.to_string(index=False))
         
         return result
     
-    def get_dropping_players(self, top_n=20):
+    def get_dropping_players(self, top_n=20, verbose=True):
         """Get players most likely to drop in price"""
-        df = self.get_price_change_predictions()
+        df = self._predictions()
         
         fallers = df[
             (df['drop_probability'] > 30) &
             (df['status'] == 'a')
-        ].nlargest(top_n, 'drop_probability')
+        ]
+        fallers = fallers.iloc[largest_positions(fallers['drop_probability'], top_n)]
         
         result = fallers[[
             'web_name', 'team_short', 'position', 'price',
             'selected_by_percent', 'net_transfers', 'drop_probability'
-        ]].copy()
-        
-        result['prediction'] = 'DROPPING TONIGHT ⬇️'
+        ]].assign(prediction='DROPPING TONIGHT ⬇️')
         
-        print(f"\n{'='*80}")
-        print(f"📉 PLAYERS LIKELY TO DROP IN PRICE (Top {top_n})")
-        print(f"{'='*80}")
-        print(result.to_string(index=False))
+        if verbose:
+            print(f"\n{'='*80}")
+            print(f"📉 PLAYERS LIKELY TO DROP IN PRICE (Top {top_n})")
+            print(f"{'='*80}")
+            print(result.to_string(index=False))
         
         return result
     
-    def check_my_team_prices(self, player_ids):
+    def check_my_team_prices(self, player_ids, verbose=True):
         """Check if any players in your team will change price"""
-        df = self.get_price_change_predictions()
+        df = self._predictions()
         
-        my_team = df[df['id'].isin(player_ids)].copy()
+        my_team = df[df['id'].isin(player_ids)]
         
         # Check for price changes
         rising = my_team[my_team['rise_probability'] > 50]
         dropping = my_team[my_team['drop_probability'] > 50]
         
-        print(f"\n{'='*80}")
-        print(f"🔔 YOUR TEAM PRICE CHANGE ALERTS")
-        print(f"{'='*80}")
+        if verbose:
+            print(f"\n{'='*80}")
+            print(f"🔔 YOUR TEAM PRICE CHANGE ALERTS")
+            print(f"{'='*80}")
         
-        if len(rising) > 0:
-            print(f"\n✅ RISING SOON (Lock in value!):")
-            print(rising[['web_name', 'team_short', 'price', 'rise_probability']].to_string(index=False))
+            if len(rising) > 0:
+                print(f"\n✅ RISING SOON (Lock in value!):")
+                print(rising[['web_name', 'team_short', 'price', 'rise_probability']].to_string(index=False))
         
-        if len(dropping) > 0:
-            print(f"\n⚠️  DROPPING SOON (Consider selling!):")
-            print(dropping[['web_name', 'team_short', 'price', 'drop_probability']].to_string(index=False))
+            if len(dropping) > 0:
+                print(f"\n⚠️  DROPPING SOON (Consider selling!):")
+                print(dropping[['web_name', 'team_short', 'price', 'drop_probability']].to_string(index=False))
         
-        if len(rising) == 0 and len(dropping) == 0:
-            print("\n✅ No significant price changes expected in your team!")
+            if len(rising) == 0 and len(dropping) == 0:
+                print("\n✅ No significant price changes expected in your team!")
         
         return {'rising': rising, 'dropping': dropping}
     
-    def get_best_buys_before_rise(self, top_n=15):
+    def get_best_buys_before_rise(self, top_n=15, verbose=True):
         """Find best value players about to rise in price"""
-        df = self.get_price_change_predictions()
-        
-        # Calculate value score (simplified)
-        df['form'] = pd.to_numeric(df['form'], errors='coerce')
-        df['points_per_game'] = pd.to_numeric(df['points_per_game'], errors='coerce')
-        
-        df['quick_value'] = (
-            df['form'].fillna(0) * 0.5 +
-            df['points_per_game'].fillna(0) * 0.5
-        ) / df['price']
+        df = self._predictions()
+        values = self._best_buy_values
         
         # Players likely to rise with good value
-        targets = df[
+        is_target = (
             (df['rise_probability'] > 40) &
             (df['status'] == 'a') &
-            (df['quick_value'] > 0.5)
-        ].nlargest(top_n, 'quick_value')
+            (values['quick_value'] > 0.5)
+        )
+        targets = df[is_target].assign(
+            form=values['form'][is_target], quick_value=values['quick_value'][is_target]
+        )
+        targets = targets.iloc[largest_positions(targets['quick_value'], top_n)]
         
         result = targets[[
             'web_name', 'team_short', 'position', 'price',
             'form', 'rise_probability', 'quick_value'
-        ]].copy()
-        
-        print(f"\n{'='*80}")
-        print(f"🎯 BEST BUYS BEFORE PRICE RISE (Top {top_n})")
-        print(f"{'='*80}")
-        print("Get these players NOW before they rise!")
-        print(result.to_string(index=False))
+        ]]
+        
+        if verbose:
+            print(f"\n{'='*80}")
+            print(f"🎯 BEST BUYS BEFORE PRICE RISE (Top {top_n})")
+            print(f"{'='*80}")
+            print("Get these players NOW before they rise!")
+            print(result.to_string(index=False))
         
         return result
 
@@ -0,0 +1,18 @@
+"""
+WSGI entry point for the FPL Analytics web app
+Builds the assistant once before the server forks its workers:
+    gunicorn -w 4 --threads 2 --preload wsgi:app
+
+The shared HTTP session's pooled connections are closed after that preload,
+otherwise every forked worker would inherit (and write to) the same sockets
+"""
+
+from app import app, get_assistant
+from fpl_data_fetcher import SESSION
+
+# Load all data and features up front so preloaded workers share them
+get_assistant()
+
+# Empty the connection pools before the fork; each worker then opens its own
+# (the session itself stays usable)
+SESSION.close()